@@ -1,21 +1,82 @@
 """
 Analytics module for tracking pathfinding performance.
-Uses Binary Search Tree for efficient sorted storage.
+Uses a self-balancing (AVL) Binary Search Tree for efficient sorted storage.
 """
 
-import statistics
+import numpy as np
+
+
+# Initial capacity of the preallocated duration buffer (doubles when full)
+_INITIAL_CAPACITY = 64
+
+# Solved queries kept for replay; each holds a full visit order, so keep few
+_SOLVED_MAZE_LIMIT = 8
 
 
 class BSTNode:
     """Node in Binary Search Tree for storing performance data"""
     
+    __slots__ = ('duration', 'algorithm_name', 'count', 'left', 'right', 'height', 'runs')
+    
     def __init__(self, duration, algorithm_name="Unknown"):
         self.duration = duration
         self.algorithm_name = algorithm_name
         self.count = 1
         self.left = None
         self.right = None
-        self.runs = []  # Store individual run details
+        self.height = 1  # Subtree height for AVL balancing
+        self.runs = None  # Individual run details (list, allocated on first metadata)
+
+
+def _height(node):
+    """Height of a subtree (0 for an empty subtree)"""
+    return node.height if node is not None else 0
+
+
+def _update_height(node):
+    """Recompute a node's height from its children"""
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+
+def _rotate_left(node):
+    """Rotate subtree left and return the new subtree root"""
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rotate_right(node):
+    """Rotate subtree right and return the new subtree root"""
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rebalance(node):
+    """
+    Restore the AVL invariant (child heights differ by at most 1).
+    Keeps the tree at O(log n) height even when runs arrive in sorted order.
+    """
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    
+    return node
 
 
 class Analytics:
@@ -24,12 +85,72 @@ class Analytics:
     def __init__(self):
         self.path_history_tree = None
         self.solved_mazes = {}
-        self.all_runs = []
-        self.algorithm_stats = {}
+        self._reset_run_storage()
+    
+    def _reset_run_storage(self):
+        """
+        Reset the per-run column buffers and running statistics.
+        
+        Runs are stored as parallel typed arrays (struct-of-arrays) rather than
+        a list of dicts; algorithm names are interned to small integer ids.
+        The caller's metadata dicts are kept as given, for export only.
+        """
+        self._durations = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._algo_ids = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._nodes_explored = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._path_lengths = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._run_metadata = []
+        self._algo_names = []
+        self._algo_ids_by_name = {}
+        self._algo_stats = []  # Per-algorithm stats, indexed by algorithm id
+        
+        # Running duration statistics (Welford's online algorithm)
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = float('inf')
+        self._max = float('-inf')
+    
+    def _grow_run_storage(self):
+        """Double the capacity of the per-run column buffers"""
+        capacity = 2 * len(self._durations)
+        for name in ('_durations', '_algo_ids', '_nodes_explored', '_path_lengths'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._n] = column[:self._n]
+            setattr(self, name, grown)
+    
+    @property
+    def algorithm_stats(self):
+        """Per-algorithm statistics keyed by algorithm name"""
+        return dict(zip(self._algo_names, self._algo_stats))
+    
+    @property
+    def all_runs(self):
+        """All runs in insertion order, materialized as a list of dicts"""
+        return [{
+            'duration': float(self._durations[i]),
+            'algorithm': self._algo_names[self._algo_ids[i]],
+            'metadata': self._run_metadata[i]
+        } for i in range(self._n)]
     
     def generate_key(self, width, height, depth, start, goal):
-        """Generate unique key for a maze configuration"""
-        return f"{width}x{height}x{depth}|{start.x},{start.y},{start.z}|{goal.x},{goal.y},{goal.z}"
+        """Generate unique (hashable tuple) key for a maze configuration"""
+        return (width, height, depth, start.x, start.y, start.z, goal.x, goal.y, goal.z)
+    
+    def get_solved(self, key):
+        """Stored result for a solved query, or None; a hit becomes most recent"""
+        result = self.solved_mazes.pop(key, None)
+        if result is not None:
+            self.solved_mazes[key] = result
+        return result
+    
+    def store_solved(self, key, result):
+        """Store a solved query, evicting the least recently used beyond the limit"""
+        self.solved_mazes.pop(key, None)
+        self.solved_mazes[key] = result
+        while len(self.solved_mazes) > _SOLVED_MAZE_LIMIT:
+            del self.solved_mazes[next(iter(self.solved_mazes))]
     
     def insert_into_bst(self, duration, algorithm_name="Unknown", metadata=None):
         """
@@ -40,76 +161,138 @@ class Analytics:
             algorithm_name: Name of the algorithm used
             metadata: Additional run information (dict)
         """
-        if self.path_history_tree is None:
-            self.path_history_tree = BSTNode(duration, algorithm_name)
-            if metadata:
-                self.path_history_tree.runs.append(metadata)
+        self._insert(duration, algorithm_name, metadata)
+        
+        # Fixed-schema metadata fields, read once (-1 marks a missing value)
+        if metadata:
+            nodes_explored = metadata.get('nodes_explored', -1)
+            path_length = metadata.get('path_length', -1)
         else:
-            self._insert_recursive(self.path_history_tree, duration, algorithm_name, metadata)
+            nodes_explored = path_length = -1
         
-        # Track algorithm statistics
-        if algorithm_name not in self.algorithm_stats:
-            self.algorithm_stats[algorithm_name] = {
+        # Track algorithm statistics (names interned to integer ids)
+        algo_id = self._algo_ids_by_name.get(algorithm_name)
+        if algo_id is None:
+            algo_id = len(self._algo_names)
+            self._algo_names.append(algorithm_name)
+            self._algo_ids_by_name[algorithm_name] = algo_id
+            self._algo_stats.append({
                 'runs': 0,
                 'total_time': 0,
                 'total_nodes_explored': 0,
                 'total_path_length': 0,
                 'best_time': float('inf'),
                 'worst_time': 0
-            }
+            })
         
-        stats = self.algorithm_stats[algorithm_name]
+        stats = self._algo_stats[algo_id]
         stats['runs'] += 1
         stats['total_time'] += duration
         stats['best_time'] = min(stats['best_time'], duration)
         stats['worst_time'] = max(stats['worst_time'], duration)
         
-        if metadata:
-            if 'nodes_explored' in metadata:
-                stats['total_nodes_explored'] += metadata['nodes_explored']
-            if 'path_length' in metadata:
-                stats['total_path_length'] += metadata['path_length']
-        
-        # Store in all runs list
-        self.all_runs.append({
-            'duration': duration,
-            'algorithm': algorithm_name,
-            'metadata': metadata
-        })
-    
-    def _insert_recursive(self, current_node, duration, algorithm_name, metadata):
-        """Recursively insert into BST"""
-        if duration < current_node.duration:
-            if current_node.left is None:
-                current_node.left = BSTNode(duration, algorithm_name)
-                if metadata:
-                    current_node.left.runs.append(metadata)
+        if nodes_explored > 0:
+            stats['total_nodes_explored'] += nodes_explored
+        if path_length > 0:
+            stats['total_path_length'] += path_length
+        
+        # Store run as a row in the column buffers
+        if self._n == len(self._durations):
+            self._grow_run_storage()
+        
+        row = self._n
+        self._durations[row] = duration
+        self._algo_ids[row] = algo_id
+        self._nodes_explored[row] = nodes_explored
+        self._path_lengths[row] = path_length
+        self._run_metadata.append(metadata)
+        
+        # Update running statistics
+        self._n += 1
+        delta = duration - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (duration - self._mean)
+        self._min = min(self._min, duration)
+        self._max = max(self._max, duration)
+    
+    def _insert(self, duration, algorithm_name, metadata):
+        """Iteratively insert into BST, rebalancing along the insertion path"""
+        path = []
+        current = self.path_history_tree
+        
+        while current is not None:
+            if duration < current.duration:
+                path.append(current)
+                current = current.left
+            elif duration > current.duration:
+                path.append(current)
+                current = current.right
             else:
-                self._insert_recursive(current_node.left, duration, algorithm_name, metadata)
-        elif duration > current_node.duration:
-            if current_node.right is None:
-                current_node.right = BSTNode(duration, algorithm_name)
+                # Same duration, increment count
+                current.count += 1
                 if metadata:
-                    current_node.right.runs.append(metadata)
-            else:
-                self._insert_recursive(current_node.right, duration, algorithm_name, metadata)
+                    if current.runs is None:
+                        current.runs = [metadata]
+                    else:
+                        current.runs.append(metadata)
+                return
+        
+        new_node = BSTNode(duration, algorithm_name)
+        if metadata:
+            new_node.runs = [metadata]
+        
+        if not path:
+            self.path_history_tree = new_node
+            return
+        
+        if duration < path[-1].duration:
+            path[-1].left = new_node
         else:
-            # Same duration, increment count
-            current_node.count += 1
-            if metadata:
-                current_node.runs.append(metadata)
+            path[-1].right = new_node
+        
+        # Walk back up, stopping once a subtree's height is unchanged
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree = _rebalance(node)
+            
+            if subtree is node:
+                if node.height == old_height:
+                    break
+                continue
+            
+            if i == 0:
+                self.path_history_tree = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+            break  # A rotation restores the subtree's pre-insert height
     
-    def display_stats_inorder(self, node=None):
-        """Display all run statistics in sorted order"""
+    def _inorder(self, node=None):
+        """Yield BST nodes from fastest to slowest using an explicit stack"""
         if node is None:
             node = self.path_history_tree
         
-        if node:
-            self.display_stats_inorder(node.left)
-            print(f"Duration: {node.duration:.2f} ms | "
-                  f"Algorithm: {node.algorithm_name} | "
-                  f"Frequency: {node.count}")
-            self.display_stats_inorder(node.right)
+        stack = []
+        while stack or node is not None:
+            # Descend left (faster times)
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            
+            node = stack.pop()
+            yield node
+            
+            # Continue with slower times
+            node = node.right
+    
+    def display_stats_inorder(self, node=None):
+        """Display all run statistics in sorted order"""
+        for current in self._inorder(node):
+            print(f"Duration: {current.duration:.2f} ms | "
+                  f"Algorithm: {current.algorithm_name} | "
+                  f"Frequency: {current.count}")
     
     def find_fastest_run(self):
         """Find the fastest run (leftmost node in BST)"""
@@ -141,47 +324,68 @@ class Analytics:
             'count': current.count
         }
     
-    def print_leaderboard(self, node=None, first_call=True, limit=10):
+    def get_leaderboard(self, limit=10):
+        """
+        Get the top N fastest runs, fastest first.
+        Stops the in-order walk after N nodes: O(log n + N) on the balanced tree.
+        """
+        leaderboard = []
+        for node in self._inorder():
+            if len(leaderboard) >= limit:
+                break
+            leaderboard.append({
+                'duration': node.duration,
+                'algorithm': node.algorithm_name,
+                'count': node.count
+            })
+        
+        return leaderboard
+    
+    def print_leaderboard(self, limit=10):
         """Print top N fastest runs"""
-        if first_call:
-            node = self.path_history_tree
-            print("\n" + "="*70)
-            print("PERFORMANCE LEADERBOARD (Fastest to Slowest)")
-            print("="*70)
-            self._count = 0
-            self._limit = limit
-        
-        if node is not None and self._count < self._limit:
-            # Traverse left (faster times)
-            self.print_leaderboard(node.left, False, limit)
-            
-            # Print current if within limit
-            if self._count < self._limit:
-                self._count += 1
-                print(f"#{self._count:2d} | {node.duration:8.2f} ms | "
-                      f"{node.algorithm_name:20s} | Count: {node.count}")
-            
-            # Traverse right (slower times)
-            self.print_leaderboard(node.right, False, limit)
+        print("\n" + "="*70)
+        print("PERFORMANCE LEADERBOARD (Fastest to Slowest)")
+        print("="*70)
         
-        if first_call:
-            print("="*70)
+        for rank, entry in enumerate(self.get_leaderboard(limit), 1):
+            print(f"#{rank:2d} | {entry['duration']:8.2f} ms | "
+                  f"{entry['algorithm']:20s} | Count: {entry['count']}")
+        
+        print("="*70)
     
     def get_algorithm_summary(self):
-        """Get summary statistics for each algorithm"""
-        summary = {}
+        """Get summary statistics for each algorithm (grouped over the run columns)"""
+        n = self._n
+        num_algos = len(self._algo_names)
+        if n == 0:
+            return {}
         
-        for algo_name, stats in self.algorithm_stats.items():
-            if stats['runs'] > 0:
+        algo_ids = self._algo_ids[:n]
+        durations = self._durations[:n]
+        
+        # Group aggregation by algorithm id; missing metadata (-1) counts as 0
+        runs = np.bincount(algo_ids, minlength=num_algos)
+        total_time = np.bincount(algo_ids, weights=durations, minlength=num_algos)
+        total_nodes = np.bincount(algo_ids, weights=np.maximum(self._nodes_explored[:n], 0),
+                                  minlength=num_algos)
+        total_path = np.bincount(algo_ids, weights=np.maximum(self._path_lengths[:n], 0),
+                                 minlength=num_algos)
+        best_time = np.full(num_algos, np.inf)
+        worst_time = np.full(num_algos, -np.inf)
+        np.minimum.at(best_time, algo_ids, durations)
+        np.maximum.at(worst_time, algo_ids, durations)
+        
+        summary = {}
+        for algo_id, algo_name in enumerate(self._algo_names):
+            algo_runs = int(runs[algo_id])
+            if algo_runs > 0:
                 summary[algo_name] = {
-                    'runs': stats['runs'],
-                    'avg_time': stats['total_time'] / stats['runs'],
-                    'best_time': stats['best_time'],
-                    'worst_time': stats['worst_time'],
-                    'avg_nodes_explored': stats['total_nodes_explored'] / stats['runs'] 
-                                         if stats['total_nodes_explored'] > 0 else 0,
-                    'avg_path_length': stats['total_path_length'] / stats['runs']
-                                      if stats['total_path_length'] > 0 else 0
+                    'runs': algo_runs,
+                    'avg_time': float(total_time[algo_id] / algo_runs),
+                    'best_time': float(best_time[algo_id]),
+                    'worst_time': float(worst_time[algo_id]),
+                    'avg_nodes_explored': float(total_nodes[algo_id] / algo_runs),
+                    'avg_path_length': float(total_path[algo_id] / algo_runs)
                 }
         
         return summary
@@ -213,19 +417,17 @@ class Analytics:
     
     def get_statistics(self):
         """Get overall statistics across all runs"""
-        if not self.all_runs:
+        if self._n == 0:
             return None
         
-        durations = [run['duration'] for run in self.all_runs]
-        
         return {
-            'total_runs': len(self.all_runs),
-            'mean_duration': statistics.mean(durations),
-            'median_duration': statistics.median(durations),
-            'stdev_duration': statistics.stdev(durations) if len(durations) > 1 else 0,
-            'min_duration': min(durations),
-            'max_duration': max(durations),
-            'algorithms_used': len(self.algorithm_stats)
+            'total_runs': self._n,
+            'mean_duration': self._mean,
+            'median_duration': float(np.median(self._durations[:self._n])),
+            'stdev_duration': (self._m2 / (self._n - 1)) ** 0.5 if self._n > 1 else 0,
+            'min_duration': self._min,
+            'max_duration': self._max,
+            'algorithms_used': len(self._algo_stats)
         }
     
     def export_data(self):
@@ -240,5 +442,4 @@ class Analytics:
         """Clear all analytics data"""
         self.path_history_tree = None
         self.solved_mazes = {}
-        self.all_runs = []
-        self.algorithm_stats = {}
+        self._reset_run_storage()
@@ -4,10 +4,16 @@
 
 import streamlit as st
 import time
+import hashlib
+import numpy as np
+from functools import partial
 from maze_engines import MazeEngine
-from pathfinders import a_star, bfs, dijkstra
+from pathfinders import a_star, bfs, dijkstra, bidirectional_search
 from analytics import Analytics
-from voxel_visualizer import create_voxel_maze_visualization
+from voxel_visualizer import (
+    create_voxel_maze_visualization, create_animated_maze_visualization, create_maze_wireframe,
+    build_static_figure, MAX_VISITED_POINTS
+)
 
 st.set_page_config(
     page_title="3D Maze Pathfinder",
@@ -15,8 +21,94 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Pathfinding dispatch table (also drives the algorithm selectbox options)
+ALGORITHM_DISPATCH = {
+    'A*': partial(a_star, heuristic="manhattan"),
+    'BFS': bfs,
+    'Dijkstra': dijkstra,
+    'Bidirectional BFS': bidirectional_search
+}
+
+# Searches that explore fewer nodes than this are shown as the final result directly
+MIN_ANIMATED_VISITS = 200
+
+# Generation labels -> MazeEngine.generate_maze algorithm names
+GENERATION_ALGORITHMS = {
+    "Recursive Backtracking": "recursive_backtracking",
+    "Kruskal's Algorithm": "kruskal"
+}
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_maze_figure(_engine, maze_token, visited_nodes, final_path, start, goal,
+                       title, show_walls, wall_opacity, animated=False,
+                       max_points=MAX_VISITED_POINTS):
+    """
+    Build the voxel figure, memoized per (maze, visited, path, display) inputs.
+    The engine itself is not hashed; maze_token identifies its layout.
+    With animated=True the figure carries client-side playback frames.
+    """
+    build = create_animated_maze_visualization if animated else create_voxel_maze_visualization
+    return build(
+        _engine,
+        visited_nodes=visited_nodes, final_path=final_path,
+        start=start, goal=goal, title=title,
+        show_walls=show_walls, wall_opacity=wall_opacity, wall_color="gray",
+        max_points=max_points,
+        base_figure=cached_static_figure(_engine, maze_token, start, goal, show_walls)
+    )
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cached_static_figure(_engine, maze_token, start, goal, show_walls):
+    """
+    Walls, start/goal markers and scene layout for one maze, cloned by every
+    result figure drawn on it. Treat as read-only.
+    """
+    return build_static_figure(
+        _engine, start, goal, show_walls,
+        wireframe=cached_maze_wireframe(_engine, maze_token) if show_walls else None
+    )
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cached_maze_wireframe(_engine, maze_token):
+    """
+    Wall wireframe coordinates for one maze layout, shared by every figure
+    drawn for it (results, animations, other algorithms). Treat as read-only.
+    """
+    return create_maze_wireframe(_engine)
+
+
+def maze_layout_token(engine):
+    """
+    Content hash of the packed wall layout, used as the figure cache key.
+    Recompute it after any wall edit (engine.remove_wall / refresh_walls).
+    """
+    digest = hashlib.blake2b(engine.walls_packed.tobytes(), digest_size=8).hexdigest()
+    return f"{engine.width}x{engine.height}x{engine.depth}:{digest}"
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_maze(size, algorithm, seed):
+    """
+    Generate a maze for (size, algorithm, seed) along with its layout token.
+    Each call returns a private copy, so pathfinding state never leaks between sessions.
+    """
+    engine = MazeEngine(size, size, size)
+    engine.generate_maze(algorithm=algorithm, seed=seed)
+    engine.maze_stats  # Computed here so the cached copy carries it
+    return engine, maze_layout_token(engine)
+
+
+def next_maze_seed():
+    """Generate button callback: advance the seed; the rerun then builds that maze"""
+    st.session_state.maze_seed += 1
+
+
+# Static page chrome (CSS theme, header, footer)
 # Elegant CSS Theme - Soft Purple Palette
-st.markdown("""
+APP_CSS = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
     
@@ -135,15 +227,35 @@ st.markdown("""
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
     </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = '''
+    <div class="main-header">
+        <h1>3D Maze Pathfinder</h1>
+    </div>
+'''
+
+FOOTER_HTML = """
+<div style='text-align: center; color: #666; font-size: 0.85rem;'>
+    Drag to rotate • Scroll to zoom • Shift+drag to pan
+</div>
+"""
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if 'engine' not in st.session_state:
     st.session_state.engine = None
 if 'analytics' not in st.session_state:
     st.session_state.analytics = Analytics()
-if 'race_complete' not in st.session_state:
-    st.session_state.race_complete = False
+if 'last_run' not in st.session_state:
+    st.session_state.last_run = None
+if 'maze_token' not in st.session_state:
+    st.session_state.maze_token = None
+if 'maze_seed' not in st.session_state:
+    st.session_state.maze_seed = 0
+if 'maze_params' not in st.session_state:
+    st.session_state.maze_params = None
 
 # Sidebar Configuration
 st.sidebar.title("Settings")
@@ -154,18 +266,12 @@ grid_size = st.sidebar.slider("Grid Size", 5, 15, 8)
 
 maze_algorithm = st.sidebar.selectbox(
     "Generation",
-    ["Recursive Backtracking", "Kruskal's Algorithm"]
+    list(GENERATION_ALGORITHMS)
 )
 
-if st.sidebar.button("Generate New Maze", use_container_width=True):
-    algo_map = {
-        "Recursive Backtracking": "recursive_backtracking",
-        "Kruskal's Algorithm": "kruskal"
-    }
-    st.session_state.engine = MazeEngine(grid_size, grid_size, grid_size)
-    st.session_state.engine.generate_maze(algorithm=algo_map[maze_algorithm])
-    st.session_state.race_complete = False
-    st.rerun()
+maze_seed = st.sidebar.number_input("Seed", min_value=0, step=1, key="maze_seed")
+
+st.sidebar.button("Generate New Maze", use_container_width=True, on_click=next_maze_seed)
 
 st.sidebar.divider()
 
@@ -189,7 +295,7 @@ st.sidebar.divider()
 st.sidebar.subheader("Algorithm")
 algorithm_choice = st.sidebar.selectbox(
     "Pathfinding",
-    ["A*", "BFS", "Dijkstra"]
+    list(ALGORITHM_DISPATCH)
 )
 
 st.sidebar.divider()
@@ -199,6 +305,7 @@ st.sidebar.subheader("Display")
 show_walls = st.sidebar.checkbox("Show Walls", value=True)
 wall_opacity = st.sidebar.slider("Wall Opacity", 0.1, 0.5, 0.25)
 show_animation = st.sidebar.checkbox("Animate", value=True)
+max_points = st.sidebar.slider("Max Explored Points", 500, MAX_VISITED_POINTS, MAX_VISITED_POINTS, step=500)
 
 st.sidebar.divider()
 
@@ -224,17 +331,15 @@ with st.sidebar.expander("Analytics", expanded=False):
         st.info("No data yet. Run an algorithm to see stats!")
 
 # Main Header
-st.markdown('''
-    <div class="main-header">
-        <h1>3D Maze Pathfinder</h1>
-    </div>
-''', unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
-# Initialize engine if needed
-if st.session_state.engine is None:
+# (Re)build the maze whenever size, generator or seed differ from the current one
+maze_params = (grid_size, GENERATION_ALGORITHMS[maze_algorithm], maze_seed)
+if st.session_state.engine is None or st.session_state.maze_params != maze_params:
     with st.spinner("Generating maze..."):
-        st.session_state.engine = MazeEngine(grid_size, grid_size, grid_size)
-        st.session_state.engine.generate_maze()
+        st.session_state.engine, st.session_state.maze_token = build_maze(*maze_params)
+    st.session_state.maze_params = maze_params
+    st.session_state.last_run = None
 
 # Quick stats
 col1, col2, col3 = st.columns(3)
@@ -243,41 +348,18 @@ with col1:
 with col2:
     st.metric("Cells", f"{grid_size**3}")
 with col3:
-    stats = st.session_state.engine.get_maze_stats()
-    st.metric("Walls", stats['total_walls'])
-
-# Run button
-st.markdown("")
-_, center_col, _ = st.columns([1, 2, 1])
-with center_col:
-    run_button = st.button(f"▶ RUN {algorithm_choice}", use_container_width=True)
+    st.metric("Walls", st.session_state.engine.maze_stats['total_walls'])
 
-if run_button:
-    st.session_state.race_complete = False
-    
-    try:
-        start_node = st.session_state.engine.grid[start_x][start_y][start_z]
-        goal_node = st.session_state.engine.grid[goal_x][goal_y][goal_z]
-    except IndexError:
-        st.error("Invalid coordinates!")
-        st.stop()
-    
-    start_coords = (start_x, start_y, start_z)
-    goal_coords = (goal_x, goal_y, goal_z)
+# Run, results and visualization
+def render_result(result, show_walls, wall_opacity, show_animation, max_points):
+    """Results metrics and 3D view for a stored run (see run_panel)"""
+    path, v_len, order, duration = result['path'], result['v_len'], result['order'], result['duration']
+    algorithm_choice = result['algorithm']
+    start_coords, goal_coords = result['start'], result['goal']
     
-    algorithm_map = {
-        'A*': lambda s, g, m: a_star(s, g, m, heuristic="manhattan"),
-        'BFS': bfs,
-        'Dijkstra': dijkstra
-    }
-    
-    algo_func = algorithm_map[algorithm_choice]
-    
-    with st.spinner(f"Running {algorithm_choice}..."):
-        st.session_state.engine.reset_pathfinding()
-        start_time = time.time()
-        path, count, v_len, order = algo_func(start_node, goal_node, st.session_state.engine)
-        duration = (time.time() - start_time) * 1000
+    if result['replayed']:
+        st.caption("Same maze, endpoints and algorithm as an earlier run: showing its "
+                   "result and time. Replays are not re-timed or added to the stats.")
     
     # Results
     st.markdown("---")
@@ -297,79 +379,110 @@ if run_button:
         else:
             st.metric("Efficiency", "N/A")
     
-    # Store in analytics
-    if path:
-        st.session_state.analytics.insert_into_bst(
-            duration, algorithm_choice,
-            {'nodes_explored': count, 'path_length': len(path)}
-        )
-    
     # Visualization
+    # (N, 3) int16 coordinate arrays: column slices for plotting, cheap to hash for the cache
+    order_coords = np.asarray(order, dtype=np.int16).reshape(-1, 3)
+    path_coords = np.asarray(path or [], dtype=np.int16).reshape(-1, 3)
     st.markdown("### 3D Visualization")
     viz_container = st.empty()
     
-    if show_animation and path:
-        progress = st.progress(0)
-        
-        # Step 1: Initial
-        progress.progress(20, "Initializing...")
-        fig = create_voxel_maze_visualization(
-            st.session_state.engine,
-            visited_nodes=None, final_path=None,
-            start=start_coords, goal=goal_coords,
-            title=f"{algorithm_choice}",
-            show_walls=show_walls, wall_opacity=wall_opacity, wall_color="gray"
-        )
-        viz_container.plotly_chart(fig, use_container_width=True, key="v1")
-        time.sleep(0.4)
-        
-        # Step 2: Explored
-        progress.progress(60, "Exploring...")
-        fig = create_voxel_maze_visualization(
-            st.session_state.engine,
-            visited_nodes=order, final_path=None,
-            start=start_coords, goal=goal_coords,
-            title=f"{algorithm_choice} - Explored {len(order)} nodes",
-            show_walls=show_walls, wall_opacity=wall_opacity, wall_color="gray"
-        )
-        viz_container.plotly_chart(fig, use_container_width=True, key="v2")
-        time.sleep(0.5)
-        
-        # Step 3: Final
-        progress.progress(100, "Done!")
-        fig = create_voxel_maze_visualization(
-            st.session_state.engine,
-            visited_nodes=order, final_path=path,
-            start=start_coords, goal=goal_coords,
-            title=f"{algorithm_choice} - Path Found!",
-            show_walls=show_walls, wall_opacity=wall_opacity, wall_color="gray"
+    if show_animation and path and v_len >= MIN_ANIMATED_VISITS:
+        # One figure with init/explored/final frames; the browser plays them back
+        fig = cached_maze_figure(
+            st.session_state.engine, st.session_state.maze_token,
+            order_coords, path_coords, start_coords, goal_coords,
+            f"{algorithm_choice}", show_walls, wall_opacity, animated=True,
+            max_points=max_points
         )
-        viz_container.plotly_chart(fig, use_container_width=True, key="v3")
+        viz_container.plotly_chart(fig, use_container_width=True, key="maze_view")
     else:
-        fig = create_voxel_maze_visualization(
-            st.session_state.engine,
-            visited_nodes=order, final_path=path,
-            start=start_coords, goal=goal_coords,
-            title=f"{algorithm_choice} - Result",
-            show_walls=show_walls, wall_opacity=wall_opacity, wall_color="gray"
+        fig = cached_maze_figure(
+            st.session_state.engine, st.session_state.maze_token,
+            order_coords, path_coords, start_coords, goal_coords,
+            f"{algorithm_choice} - Result", show_walls, wall_opacity,
+            max_points=max_points
         )
-        viz_container.plotly_chart(fig, use_container_width=True)
+        viz_container.plotly_chart(fig, use_container_width=True, key="maze_view")
     
     if path:
         st.success(f"✓ Path found! Length: {len(path)}, Nodes explored: {v_len}")
     else:
         st.error("✗ No path found")
+
+
+@st.fragment
+def run_panel(algorithm_choice, start_coords, goal_coords, show_walls, wall_opacity,
+              show_animation, max_points):
+    """
+    RUN button, results and 3D view. As a fragment, clicking RUN reruns only
+    this panel; sidebar widgets still trigger a full rerun with fresh arguments.
+    
+    The latest result is kept in session state and drawn from there. A run that
+    adds to the analytics reruns the whole app so the sidebar stats catch up.
+    """
+    st.markdown("")
+    _, center_col, _ = st.columns([1, 2, 1])
+    with center_col:
+        run_button = st.button(f"▶ RUN {algorithm_choice}", use_container_width=True)
     
-    st.session_state.race_complete = True
+    if run_button:
+        st.session_state.last_run = None
+        
+        # Bounds-checked lookups (coordinates can exceed a maze built at a smaller size)
+        start_node = st.session_state.engine.get_node(*start_coords)
+        goal_node = st.session_state.engine.get_node(*goal_coords)
+        if start_node is None or goal_node is None:
+            st.error("Invalid coordinates!")
+            return
+        
+        # Identical queries on the same maze replay the stored result
+        analytics = st.session_state.analytics
+        engine = st.session_state.engine
+        solve_key = (st.session_state.maze_token, algorithm_choice) + analytics.generate_key(
+            engine.width, engine.height, engine.depth, start_node, goal_node
+        )
+        solved = analytics.get_solved(solve_key)
+        replayed = solved is not None
+        
+        if not replayed:
+            algo_func = ALGORITHM_DISPATCH[algorithm_choice]
+            
+            with st.spinner(f"Running {algorithm_choice}..."):
+                start_time = time.perf_counter_ns()
+                path, count, v_len, order = algo_func(start_node, goal_node, engine)
+                duration = (time.perf_counter_ns() - start_time) / 1e6
+            
+            solved = (path, count, v_len, order, duration)
+            analytics.store_solved(solve_key, solved)
+        
+        path, count, v_len, order, duration = solved
+        st.session_state.last_run = {
+            'algorithm': algorithm_choice, 'start': start_coords, 'goal': goal_coords,
+            'path': path, 'v_len': v_len, 'order': order, 'duration': duration,
+            'replayed': replayed
+        }
+        
+        # Store in analytics, then rerun the whole app so the sidebar shows it
+        if path and not replayed:
+            analytics.insert_into_bst(
+                duration, algorithm_choice,
+                {'nodes_explored': count, 'path_length': len(path)}
+            )
+            st.rerun(scope="app")
+    
+    if st.session_state.last_run is not None:
+        render_result(st.session_state.last_run, show_walls, wall_opacity,
+                      show_animation, max_points)
+    else:
+        # Initial info
+        st.info("Click **RUN** to start pathfinding visualization")
 
-# Initial info
-if not st.session_state.race_complete:
-    st.info("Click **RUN** to start pathfinding visualization")
+
+run_panel(
+    algorithm_choice, (start_x, start_y, start_z), (goal_x, goal_y, goal_z),
+    show_walls, wall_opacity, show_animation, max_points
+)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666; font-size: 0.85rem;'>
-    Drag to rotate • Scroll to zoom • Shift+drag to pan
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
\ No newline at end of file
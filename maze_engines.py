@@ -4,7 +4,24 @@ Generates perfect mazes (no loops, exactly one path between any two points).
 """
 
 import random
-from node import Node
+from itertools import permutations
+from functools import cached_property
+import numpy as np
+from node import Node, ALL_WALLS, INF, NORTH, SOUTH, EAST, WEST, UP, DOWN
+
+
+# Unit step and facing wall bit for each of the six neighbor directions
+DIRECTIONS = (
+    (1, 0, 0, EAST),    # +X
+    (-1, 0, 0, WEST),   # -X
+    (0, 1, 0, UP),      # +Y
+    (0, -1, 0, DOWN),   # -Y
+    (0, 0, 1, NORTH),   # +Z
+    (0, 0, -1, SOUTH)   # -Z
+)
+
+# Every ordering of DIRECTIONS; DFS generation picks one per cell
+DIRECTION_ORDERINGS = tuple(permutations(DIRECTIONS))
 
 
 class MazeEngine:
@@ -27,30 +44,37 @@ class MazeEngine:
                       for y in range(height)] 
                       for x in range(width)]
         
+        # The same nodes in one flat list; flat index is (x * height + y) * depth + z
+        self.nodes = [node for plane in self.grid for row in plane for node in row]
+        
         self.generation_algorithm = "Recursive Backtracking (DFS)"
+        self.rng = random.Random()
+        
+        # Walls packed one byte per cell (bits from WALL_BITS). This is a snapshot of
+        # Node.walls kept in step by generate_maze and remove_wall; code that edits
+        # Node.walls directly must call refresh_walls() afterwards
+        self.walls_packed = None
     
     def get_node(self, x, y, z):
         """Safely get a node from the grid"""
         if 0 <= x < self.width and 0 <= y < self.height and 0 <= z < self.depth:
-            return self.grid[x][y][z]
+            return self.nodes[(x * self.height + y) * self.depth + z]
         return None
     
+    def node_at(self, x, y, z):
+        """Get a node by in-bounds coordinates via the flat index (no bounds check)"""
+        return self.nodes[(x * self.height + y) * self.depth + z]
+    
     def get_unvisited_neighbors(self, node):
         """Get all unvisited neighboring cells for maze generation"""
         neighbors = []
-        directions = [
-            (1, 0, 0, 'east'),   # +X
-            (-1, 0, 0, 'west'),  # -X
-            (0, 1, 0, 'up'),     # +Y
-            (0, -1, 0, 'down'),  # -Y
-            (0, 0, 1, 'north'),  # +Z
-            (0, 0, -1, 'south')  # -Z
-        ]
-        
-        for dx, dy, dz, direction in directions:
+        nodes = self.nodes
+        width, height, depth = self.width, self.height, self.depth
+        
+        for dx, dy, dz, _ in DIRECTIONS:
             nx, ny, nz = node.x + dx, node.y + dy, node.z + dz
-            if 0 <= nx < self.width and 0 <= ny < self.height and 0 <= nz < self.depth:
-                neighbor = self.grid[nx][ny][nz]
+            if 0 <= nx < width and 0 <= ny < height and 0 <= nz < depth:
+                neighbor = nodes[(nx * height + ny) * depth + nz]
                 if not neighbor.visited:
                     neighbors.append(neighbor)
         
@@ -59,21 +83,18 @@ class MazeEngine:
     def get_neighbors(self, node):
         """Get all accessible neighboring cells (no walls between them)"""
         neighbors = []
-        directions = [
-            (1, 0, 0),   # +X (east)
-            (-1, 0, 0),  # -X (west)
-            (0, 1, 0),   # +Y (up)
-            (0, -1, 0),  # -Y (down)
-            (0, 0, 1),   # +Z (north)
-            (0, 0, -1)   # -Z (south)
-        ]
-        
-        for dx, dy, dz in directions:
+        nodes = self.nodes
+        width, height, depth = self.width, self.height, self.depth
+        walls = node.walls
+        
+        for dx, dy, dz, bit in DIRECTIONS:
+            # Check if wall exists between current node and neighbor
+            if walls & bit:
+                continue
             nx, ny, nz = node.x + dx, node.y + dy, node.z + dz
-            if 0 <= nx < self.width and 0 <= ny < self.height and 0 <= nz < self.depth:
-                neighbor = self.grid[nx][ny][nz]
-                # Check if wall exists between current node and neighbor
-                if not node.has_wall_to(neighbor) and not neighbor.is_wall:
+            if 0 <= nx < width and 0 <= ny < height and 0 <= nz < depth:
+                neighbor = nodes[(nx * height + ny) * depth + nz]
+                if not neighbor.is_wall:
                     neighbors.append(neighbor)
         
         return neighbors
@@ -83,46 +104,61 @@ class MazeEngine:
         Recursive Backtracking (DFS) maze generation algorithm.
         Creates a perfect maze with no loops.
         
+        The backtracking runs on an explicit stack of (node, remaining directions)
+        pairs, so deep corridors never hit Python's recursion limit. Each cell
+        draws one of the 720 direction orderings instead of shuffling a list.
+        
         Args:
-            current: Current node being processed
+            current: Node to start carving from
         """
-        current.visited = True
-        
-        # Get all unvisited neighbors
-        neighbors = self.get_unvisited_neighbors(current)
+        nodes = self.nodes
+        width, height, depth = self.width, self.height, self.depth
+        choice = self.rng.choice
         
-        # Shuffle for randomness
-        random.shuffle(neighbors)
+        current.visited = True
+        stack = [(current, iter(choice(DIRECTION_ORDERINGS)))]
         
-        # Visit each unvisited neighbor
-        for neighbor in neighbors:
-            if not neighbor.visited:
-                # Remove wall between current and neighbor
-                current.remove_wall_to(neighbor)
-                
-                # Recursively visit the neighbor
-                self.recursive_backtracking(neighbor)
+        while stack:
+            current, directions = stack[-1]
+            
+            # Visit the next unvisited neighbor in this cell's random order, or backtrack
+            for dx, dy, dz, _ in directions:
+                nx, ny, nz = current.x + dx, current.y + dy, current.z + dz
+                if 0 <= nx < width and 0 <= ny < height and 0 <= nz < depth:
+                    neighbor = nodes[(nx * height + ny) * depth + nz]
+                    if not neighbor.visited:
+                        # Remove wall between current and neighbor
+                        current.remove_wall_to(neighbor)
+                        neighbor.visited = True
+                        stack.append((neighbor, iter(choice(DIRECTION_ORDERINGS))))
+                        break
+            else:
+                stack.pop()
     
-    def generate_maze(self, algorithm="recursive_backtracking", start_pos=None):
+    def generate_maze(self, algorithm="recursive_backtracking", start_pos=None, seed=None):
         """
         Generate a 3D maze using specified algorithm.
         
         Args:
             algorithm: Algorithm to use ("recursive_backtracking" or "kruskal")
             start_pos: Starting position tuple (x, y, z), defaults to (0, 0, 0)
+            seed: Optional random seed; the same seed and parameters give the same maze
         """
-        # Reset all nodes
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    self.grid[x][y][z].reset_maze_generation()
+        self.rng = random.Random(seed)
+        
+        # Reset all nodes to closed, unvisited paths in one pass
+        # (same fields as Node.reset_maze_generation, inlined for large grids)
+        for node in self.nodes:
+            node.walls = ALL_WALLS
+            node.visited = False
+            node.is_wall = False
         
         if algorithm == "recursive_backtracking":
             # Start from specified position or (0, 0, 0)
             if start_pos is None:
                 start_pos = (0, 0, 0)
             
-            start_node = self.grid[start_pos[0]][start_pos[1]][start_pos[2]]
+            start_node = self.node_at(*start_pos)
             self.recursive_backtracking(start_node)
             self.generation_algorithm = "Recursive Backtracking (DFS)"
             
@@ -130,83 +166,122 @@ class MazeEngine:
             self._generate_kruskal()
             self.generation_algorithm = "Kruskal's Algorithm (MST)"
         
-        # Ensure all nodes are marked as non-walls (paths)
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    self.grid[x][y][z].is_wall = False
+        self.refresh_walls()
+    
+    def refresh_walls(self):
+        """
+        Re-pack walls_packed from the nodes and drop the cached maze stats.
+        
+        Outer walls are forced closed on the nodes too: the searches step by flat
+        index and rely on an open wall always leading to an in-bounds cell.
+        """
+        walls = self.pack_walls()
+        sealed = walls | self._boundary_walls
+        for index in np.flatnonzero(sealed != walls).tolist():
+            self.nodes[index].walls = int(sealed.flat[index])
+        self.walls_packed = sealed
+        self.__dict__.pop('maze_stats', None)  # Recomputed on next access
+    
+    @cached_property
+    def _boundary_walls(self):
+        """Wall bits facing outside the grid, per cell (same layout as walls_packed)"""
+        boundary = np.zeros((self.width, self.height, self.depth), dtype=np.uint8)
+        boundary[0, :, :] |= WEST
+        boundary[-1, :, :] |= EAST
+        boundary[:, 0, :] |= DOWN
+        boundary[:, -1, :] |= UP
+        boundary[:, :, 0] |= SOUTH
+        boundary[:, :, -1] |= NORTH
+        return boundary
+    
+    def remove_wall(self, node, neighbor):
+        """
+        Open the wall between two adjacent cells, keeping walls_packed and
+        maze_stats in step with the nodes.
+        """
+        node.remove_wall_to(neighbor)
+        if self.walls_packed is not None:
+            self.walls_packed[node.x, node.y, node.z] = node.walls
+            self.walls_packed[neighbor.x, neighbor.y, neighbor.z] = neighbor.walls
+        self.__dict__.pop('maze_stats', None)
+    
+    def pack_walls(self):
+        """
+        Pack every cell's walls into a contiguous (width, height, depth) uint8 array.
+        Bit layout follows node.WALL_BITS, so one byte holds all six walls of a cell.
+        """
+        # self.nodes is in C order for (width, height, depth), so it reshapes directly
+        masks = bytearray(node.walls for node in self.nodes)
+        
+        return np.frombuffer(masks, dtype=np.uint8).reshape(self.width, self.height, self.depth)
     
     def _generate_kruskal(self):
         """
         Alternative: Kruskal's algorithm for maze generation.
         Uses Union-Find to create a minimum spanning tree.
+        
+        Edges are flat cell-index pairs built with NumPy index arithmetic, so the
+        only Python loop left is the union-find pass over the shuffled edges.
         """
         from maze_utils import UnionFind
         
-        uf = UnionFind(self.width * self.height * self.depth)
-        
-        # Create list of all possible edges
-        edges = []
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    node = self.grid[x][y][z]
-                    
-                    # Add edge to east neighbor
-                    if x + 1 < self.width:
-                        neighbor = self.grid[x + 1][y][z]
-                        edges.append((node, neighbor))
-                    
-                    # Add edge to up neighbor
-                    if y + 1 < self.height:
-                        neighbor = self.grid[x][y + 1][z]
-                        edges.append((node, neighbor))
-                    
-                    # Add edge to north neighbor
-                    if z + 1 < self.depth:
-                        neighbor = self.grid[x][y][z + 1]
-                        edges.append((node, neighbor))
-        
-        # Shuffle edges for randomness
-        random.shuffle(edges)
+        total = self.width * self.height * self.depth
+        uf = UnionFind(total)
+        
+        # Flat index of each cell and of its east (+X), up (+Y) and north (+Z)
+        # neighbor; strides match the (x * height + y) * depth + z layout of self.nodes
+        cells = np.arange(total).reshape(self.width, self.height, self.depth)
+        neighbors = np.stack([
+            cells + self.height * self.depth,
+            cells + self.depth,
+            cells + 1
+        ], axis=-1)
+        in_bounds = np.zeros(neighbors.shape, dtype=bool)
+        in_bounds[:-1, :, :, 0] = True
+        in_bounds[:, :-1, :, 1] = True
+        in_bounds[:, :, :-1, 2] = True
+        
+        # Boolean masking walks cells in x, y, z order with east/up/north per cell
+        sources = np.broadcast_to(cells[..., None], neighbors.shape)[in_bounds]
+        targets = neighbors[in_bounds]
+        
+        # Shuffle edges for randomness; shuffling an index list keeps the same
+        # seeded permutation as shuffling the edges themselves
+        order = list(range(len(sources)))
+        self.rng.shuffle(order)
         
         # Process edges
-        for node1, node2 in edges:
-            id1 = self._get_id(node1.x, node1.y, node1.z)
-            id2 = self._get_id(node2.x, node2.y, node2.z)
-            
+        nodes = self.nodes
+        for id1, id2 in zip(sources[order].tolist(), targets[order].tolist()):
             # If nodes are in different sets, connect them
             if uf.union(id1, id2):
+                node1 = nodes[id1]
+                node2 = nodes[id2]
                 node1.remove_wall_to(node2)
                 node1.visited = True
                 node2.visited = True
     
-    def _get_id(self, x, y, z):
-        """Convert 3D coordinates to unique ID"""
-        return z * (self.width * self.height) + y * self.width + x
-    
     def reset_pathfinding(self):
         """Reset all pathfinding-related node attributes"""
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    self.grid[x][y][z].reset_pathfinding()
+        # Same fields as Node.reset_pathfinding, inlined for large grids
+        for node in self.nodes:
+            node.g_score = INF
+            node.h_score = 0
+            node.f_score = INF
+            node.distance = INF
+            node.parent = None
     
     def get_maze_stats(self):
         """Get statistics about the generated maze"""
+        return dict(self.maze_stats)
+    
+    @cached_property
+    def maze_stats(self):
+        """Maze statistics, computed once per generated maze"""
         total_cells = self.width * self.height * self.depth
-        total_walls = 0
-        total_openings = 0
-        
-        for x in range(self.width):
-            for y in range(self.height):
-                for z in range(self.depth):
-                    node = self.grid[x][y][z]
-                    for wall in node.walls.values():
-                        if wall:
-                            total_walls += 1
-                        else:
-                            total_openings += 1
+        walls = self.walls_packed if self.walls_packed is not None else self.pack_walls()
+        total_walls = int(np.unpackbits(walls).sum())
+        total_openings = 6 * total_cells - total_walls
         
         # Each wall is counted twice (once from each side)
         total_walls //= 2
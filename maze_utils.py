@@ -2,6 +2,8 @@
 Utility classes and functions for maze generation and algorithms.
 """
 
+from time import perf_counter_ns
+
 
 class UnionFind:
     """
@@ -17,9 +19,17 @@ class UnionFind:
     
     def find(self, i):
         """Find the root of the set containing element i (with path compression)"""
-        if self.parent[i] != i:
-            self.parent[i] = self.find(self.parent[i])  # Path compression
-        return self.parent[i]
+        parent = self.parent
+        
+        # Walk up to the root, then point every node on the way straight at it
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            nxt = parent[i]
+            parent[i] = root
+            i = nxt
+        return root
     
     def union(self, i, j):
         """
@@ -58,22 +68,20 @@ class Timer:
     
     def start(self):
         """Start the timer"""
-        import time
-        self.start_time = time.time()
+        self.start_time = perf_counter_ns()
+        self.end_time = None
     
     def stop(self):
         """Stop the timer and return elapsed time in milliseconds"""
-        import time
-        self.end_time = time.time()
-        return (self.end_time - self.start_time) * 1000
+        self.end_time = perf_counter_ns()
+        return (self.end_time - self.start_time) / 1e6
     
     def elapsed_ms(self):
         """Get elapsed time in milliseconds"""
         if self.start_time is None:
             return 0
-        import time
-        current = self.end_time if self.end_time else time.time()
-        return (current - self.start_time) * 1000
+        current = self.end_time if self.end_time is not None else perf_counter_ns()
+        return (current - self.start_time) / 1e6
 
 
 def manhattan_distance_3d(node1, node2):
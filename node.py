@@ -3,7 +3,37 @@ Node class for 3D maze representation.
 Each node represents a cell in the 3D grid with thick walls for voxel visualization.
 """
 
+# Bit flag for each wall direction; a cell's walls are one int of these flags
+NORTH, SOUTH, EAST, WEST, UP, DOWN = 1, 2, 4, 8, 16, 32
+ALL_WALLS = NORTH | SOUTH | EAST | WEST | UP | DOWN
+
+WALL_BITS = {
+    'north': NORTH,   # +Z direction
+    'south': SOUTH,   # -Z direction
+    'east': EAST,     # +X direction
+    'west': WEST,     # -X direction
+    'up': UP,         # +Y direction
+    'down': DOWN      # -Y direction
+}
+
+# Wall bit facing each unit offset (dx, dy, dz), and the bit on the other side
+DIRECTION_BITS = {
+    (1, 0, 0): EAST,
+    (-1, 0, 0): WEST,
+    (0, 1, 0): UP,
+    (0, -1, 0): DOWN,
+    (0, 0, 1): NORTH,
+    (0, 0, -1): SOUTH
+}
+OPPOSITE = {NORTH: SOUTH, SOUTH: NORTH, EAST: WEST, WEST: EAST, UP: DOWN, DOWN: UP}
+
+# Shared by every node so unset scores don't allocate a float per cell
+INF = float('inf')
+
 class Node:
+    __slots__ = ('x', 'y', 'z', 'is_wall', 'walls', 'g_score', 'h_score', 'f_score',
+                 'distance', 'parent', 'visited')
+    
     def __init__(self, x, y, z, is_wall=False):
         # Spatial coordinates
         self.x = x
@@ -14,23 +44,16 @@ class Node:
         self.is_wall = is_wall
         
         # Wall connectivity for thick-wall visualization
-        # These represent which walls are present around this cell
-        self.walls = {
-            'north': True,   # +Z direction
-            'south': True,   # -Z direction
-            'east': True,    # +X direction
-            'west': True,    # -X direction
-            'up': True,      # +Y direction
-            'down': True     # -Y direction
-        }
+        # These represent which walls are present around this cell (WALL_BITS flags)
+        self.walls = ALL_WALLS
         
         # Pathfinding scores (A* algorithm)
-        self.g_score = float('inf')  # Cost from start to here
+        self.g_score = INF            # Cost from start to here
         self.h_score = 0              # Heuristic cost to goal
-        self.f_score = float('inf')  # Total cost (g + h)
+        self.f_score = INF            # Total cost (g + h)
         
         # Dijkstra's algorithm score
-        self.distance = float('inf')
+        self.distance = INF
         
         # Path reconstruction
         self.parent = None
@@ -42,82 +65,32 @@ class Node:
         """Comparison for priority queue (based on f_score for A*)"""
         return self.f_score < other.f_score
     
-    def __eq__(self, other):
-        """Equality based on coordinates"""
-        if not isinstance(other, Node):
-            return False
-        return self.x == other.x and self.y == other.y and self.z == other.z
-    
-    def __hash__(self):
-        """Hash based on coordinates for use in sets/dicts"""
-        return hash((self.x, self.y, self.z))
-    
     def reset_pathfinding(self):
         """Reset pathfinding-related attributes"""
-        self.g_score = float('inf')
+        self.g_score = INF
         self.h_score = 0
-        self.f_score = float('inf')
-        self.distance = float('inf')
+        self.f_score = INF
+        self.distance = INF
         self.parent = None
     
     def reset_maze_generation(self):
         """Reset maze generation attributes"""
         self.visited = False
-        self.walls = {
-            'north': True,
-            'south': True,
-            'east': True,
-            'west': True,
-            'up': True,
-            'down': True
-        }
+        self.walls = ALL_WALLS
     
     def remove_wall_to(self, neighbor):
         """Remove wall between this node and a neighbor"""
-        dx = neighbor.x - self.x
-        dy = neighbor.y - self.y
-        dz = neighbor.z - self.z
-        
-        # Remove appropriate walls
-        if dx == 1:  # Neighbor is to the east
-            self.walls['east'] = False
-            neighbor.walls['west'] = False
-        elif dx == -1:  # Neighbor is to the west
-            self.walls['west'] = False
-            neighbor.walls['east'] = False
-        elif dy == 1:  # Neighbor is up
-            self.walls['up'] = False
-            neighbor.walls['down'] = False
-        elif dy == -1:  # Neighbor is down
-            self.walls['down'] = False
-            neighbor.walls['up'] = False
-        elif dz == 1:  # Neighbor is to the north
-            self.walls['north'] = False
-            neighbor.walls['south'] = False
-        elif dz == -1:  # Neighbor is to the south
-            self.walls['south'] = False
-            neighbor.walls['north'] = False
+        bit = DIRECTION_BITS.get((neighbor.x - self.x, neighbor.y - self.y, neighbor.z - self.z))
+        if bit is not None:
+            self.walls &= ~bit
+            neighbor.walls &= ~OPPOSITE[bit]
     
     def has_wall_to(self, neighbor):
         """Check if there's a wall between this node and a neighbor"""
-        dx = neighbor.x - self.x
-        dy = neighbor.y - self.y
-        dz = neighbor.z - self.z
-        
-        if dx == 1:
-            return self.walls['east']
-        elif dx == -1:
-            return self.walls['west']
-        elif dy == 1:
-            return self.walls['up']
-        elif dy == -1:
-            return self.walls['down']
-        elif dz == 1:
-            return self.walls['north']
-        elif dz == -1:
-            return self.walls['south']
-        
-        return True  # Not a neighbor
+        bit = DIRECTION_BITS.get((neighbor.x - self.x, neighbor.y - self.y, neighbor.z - self.z))
+        if bit is None:
+            return True  # Not a neighbor
+        return bool(self.walls & bit)
     
     def __repr__(self):
         return f"Node({self.x}, {self.y}, {self.z}, wall={self.is_wall})"
@@ -1,26 +1,96 @@
 """
 Pathfinding algorithms for 3D maze solving.
-Includes A*, BFS, and Dijkstra's algorithm.
+Includes A*, BFS, Dijkstra's algorithm and bidirectional BFS.
 """
 
 import heapq
 from collections import deque
-from maze_utils import manhattan_distance_3d, euclidean_distance_3d
+import numpy as np
+from maze_engines import DIRECTIONS
+from node import INF
 
 
-def reconstruct_path(current_node):
+def _manhattan_table(dx, dy, dz):
+    """Vectorized maze_utils.manhattan_distance_3d"""
+    return dx + dy + dz
+
+
+def _euclidean_table(dx, dy, dz):
+    """Vectorized maze_utils.euclidean_distance_3d"""
+    return np.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def _chebyshev_table(dx, dy, dz):
+    """Vectorized maze_utils.chebyshev_distance_3d"""
+    return np.maximum(np.maximum(dx, dy), dz)
+
+
+# A* heuristics by name, as table builders: each maps the per-axis absolute
+# offsets to the goal (broadcastable NumPy arrays) to a distance for every
+# cell, so Euclidean's square roots cost one vectorized pass, not one per
+# relaxation. Manhattan is exact-integer and the default for the 6-connected grid
+HEURISTICS = {
+    'manhattan': _manhattan_table,
+    'euclidean': _euclidean_table,
+    'chebyshev': _chebyshev_table
+}
+
+# Heuristics that give integer f-scores, so A* can use bucket queues instead of a heap
+INTEGER_HEURISTICS = {'manhattan', 'chebyshev'}
+
+
+def _walk_parents(parents, nodes, index):
+    """Coordinates from index back along parent indices to the search root"""
+    path = []
+    
+    while index != -1:
+        node = nodes[index]
+        path.append((node.x, node.y, node.z))
+        index = parents[index]
+    
+    return path
+
+
+def reconstruct_path(parents, nodes, index):
     """
-    Reconstruct path from goal to start using parent pointers.
+    Reconstruct path from goal to start using parent indices.
     Returns list of coordinate tuples from start to goal.
     """
-    path = []
-    temp = current_node
+    path = _walk_parents(parents, nodes, index)
+    path.reverse()  # In place, to get start -> goal
+    return path
+
+
+def _neighbor_steps(maze):
+    """
+    (flat index offset, wall bit) for each direction, in maze.nodes' layout.
+    MazeEngine.refresh_walls keeps the outer walls closed, so a missing wall
+    always leads to an in-bounds cell and the offset needs no bounds check.
+    """
+    plane = maze.height * maze.depth
+    return tuple((dx * plane + dy * maze.depth + dz, bit) for dx, dy, dz, bit in DIRECTIONS)
+
+
+def _heuristic_table(maze, goal_node, heuristic):
+    """
+    Heuristic distance to goal_node for every cell, in maze.nodes' flat order.
+    One NumPy broadcast per search replaces a heuristic call per relaxation;
+    the values match the scalar distance helpers in maze_utils.
+    """
+    xs, ys, zs = np.ogrid[:maze.width, :maze.height, :maze.depth]
+    dx = np.abs(xs - goal_node.x)
+    dy = np.abs(ys - goal_node.y)
+    dz = np.abs(zs - goal_node.z)
     
-    while temp is not None:
-        path.append((temp.x, temp.y, temp.z))
-        temp = temp.parent
+    table = HEURISTICS[heuristic](dx, dy, dz)
     
-    return path[::-1]  # Reverse to get start -> goal
+    # Python list: per-item reads in the search loop are faster than ndarray indexing
+    return table.ravel().tolist()
+
+
+def _flat_index(maze, node):
+    """Index of node in maze.nodes"""
+    return (node.x * maze.height + node.y) * maze.depth + node.z
 
 
 def a_star(start_node, goal_node, maze, heuristic="manhattan"):
@@ -31,62 +101,144 @@ def a_star(start_node, goal_node, maze, heuristic="manhattan"):
         start_node: Starting node
         goal_node: Goal node
         maze: MazeEngine instance
-        heuristic: Heuristic function name ("manhattan" or "euclidean")
+        heuristic: Heuristic function name ("manhattan", "euclidean" or "chebyshev")
     
     Returns:
         tuple: (path, nodes_explored, visited_count, visited_order)
     """
-    # Reset pathfinding state
-    maze.reset_pathfinding()
+    # Choose heuristic (unknown names fall back to Manhattan)
+    if heuristic not in HEURISTICS:
+        heuristic = 'manhattan'
+    h_score = _heuristic_table(maze, goal_node, heuristic)
+    
+    # Unit edge weights with an integer heuristic: f-scores are small integers
+    # that never decrease, so a list of buckets replaces the heap
+    if heuristic in INTEGER_HEURISTICS:
+        return _bucket_a_star(start_node, goal_node, maze, h_score)
     
-    # Choose heuristic function
-    if heuristic == "euclidean":
-        heuristic_func = euclidean_distance_3d
-    else:
-        heuristic_func = manhattan_distance_3d
+    nodes = maze.nodes
+    steps = _neighbor_steps(maze)
+    start = _flat_index(maze, start_node)
+    goal = _flat_index(maze, goal_node)
     
-    # Initialize start node
-    start_node.g_score = 0
-    start_node.h_score = heuristic_func(start_node, goal_node)
-    start_node.f_score = start_node.h_score
+    # Per-search state over flat cell indices
+    g_score = [INF] * len(nodes)
+    parents = [-1] * len(nodes)
+    g_score[start] = 0
     
-    # Priority queue and tracking
-    open_set = []
-    heapq.heappush(open_set, (start_node.f_score, id(start_node), start_node))
-    open_set_nodes = {start_node}
+    # Priority queue of (f_score, index); the index also breaks ties
+    open_set = [(h_score[start], start)]
+    heappush, heappop, heapreplace = heapq.heappush, heapq.heappop, heapq.heapreplace
     
     visited_count = 0
     visited_order = []
     
     while open_set:
-        # Get node with lowest f_score
-        _, _, current = heapq.heappop(open_set)
+        # Peek at the lowest f_score; skip entries left behind by a later,
+        # better push of the same node (lazy deletion)
+        f_score, current = open_set[0]
+        if f_score != g_score[current] + h_score[current]:
+            heappop(open_set)
+            continue
+        
+        node = nodes[current]
+        visited_count += 1
+        visited_order.append((node.x, node.y, node.z))
+        
+        # Check if goal reached
+        if current == goal:
+            path = reconstruct_path(parents, nodes, current)
+            return path, visited_count, len(visited_order), visited_order
+        
+        # Explore neighbors; the first push replaces the current entry in one
+        # sift instead of a separate pop and push
+        popped = False
+        walls = node.walls
+        tentative_g_score = g_score[current] + 1
+        for step, bit in steps:
+            if walls & bit:
+                continue
+            neighbor = current + step
+            
+            if tentative_g_score < g_score[neighbor] and not nodes[neighbor].is_wall:
+                # This path to neighbor is better
+                parents[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                
+                entry = (tentative_g_score + h_score[neighbor], neighbor)
+                if popped:
+                    heappush(open_set, entry)
+                else:
+                    heapreplace(open_set, entry)
+                    popped = True
+        
+        if not popped:
+            heappop(open_set)
+    
+    # No path found
+    return None, visited_count, len(visited_order), visited_order
+
+
+def _bucket_a_star(start_node, goal_node, maze, h_score):
+    """
+    A* for integer heuristics (h_score from _heuristic_table), with one bucket
+    per f-score instead of a heap.
+    Buckets are offset by the start node's f-score, which never exceeds any
+    later f-score when the heuristic is consistent. Within a bucket the most
+    recently pushed node is expanded first; entries whose f-score no longer
+    matches the node's best g-score are skipped.
+    """
+    nodes = maze.nodes
+    steps = _neighbor_steps(maze)
+    start = _flat_index(maze, start_node)
+    goal = _flat_index(maze, goal_node)
+    
+    g_score = [INF] * len(nodes)
+    parents = [-1] * len(nodes)
+    g_score[start] = 0
+    
+    base_f = h_score[start]
+    buckets = [[start]]
+    f_offset = 0
+    
+    visited_count = 0
+    visited_order = []
+    
+    while f_offset < len(buckets):
+        bucket = buckets[f_offset]
+        if not bucket:
+            f_offset += 1
+            continue
         
-        if current in open_set_nodes:
-            open_set_nodes.remove(current)
+        current = bucket.pop()
+        if g_score[current] + h_score[current] - base_f != f_offset:
+            continue  # Stale entry, superseded by a better push
         
+        node = nodes[current]
         visited_count += 1
-        visited_order.append((current.x, current.y, current.z))
+        visited_order.append((node.x, node.y, node.z))
         
         # Check if goal reached
-        if current == goal_node:
-            path = reconstruct_path(current)
+        if current == goal:
+            path = reconstruct_path(parents, nodes, current)
             return path, visited_count, len(visited_order), visited_order
         
         # Explore neighbors
-        for neighbor in maze.get_neighbors(current):
-            tentative_g_score = current.g_score + 1
+        walls = node.walls
+        tentative_g_score = g_score[current] + 1
+        for step, bit in steps:
+            if walls & bit:
+                continue
+            neighbor = current + step
             
-            if tentative_g_score < neighbor.g_score:
-                # This path to neighbor is better
-                neighbor.parent = current
-                neighbor.g_score = tentative_g_score
-                neighbor.h_score = heuristic_func(neighbor, goal_node)
-                neighbor.f_score = neighbor.g_score + neighbor.h_score
+            if tentative_g_score < g_score[neighbor] and not nodes[neighbor].is_wall:
+                parents[neighbor] = current
+                g_score[neighbor] = tentative_g_score
                 
-                if neighbor not in open_set_nodes:
-                    heapq.heappush(open_set, (neighbor.f_score, id(neighbor), neighbor))
-                    open_set_nodes.add(neighbor)
+                offset = tentative_g_score + h_score[neighbor] - base_f
+                while offset >= len(buckets):
+                    buckets.append([])
+                buckets[offset].append(neighbor)
     
     # No path found
     return None, visited_count, len(visited_order), visited_order
@@ -105,29 +257,39 @@ def bfs(start_node, goal_node, maze):
     Returns:
         tuple: (path, nodes_explored, visited_count, visited_order)
     """
-    # Reset pathfinding state
-    maze.reset_pathfinding()
+    nodes = maze.nodes
+    steps = _neighbor_steps(maze)
+    start = _flat_index(maze, start_node)
+    goal = _flat_index(maze, goal_node)
     
-    queue = deque([start_node])
-    visited = {start_node}
+    parents = [-1] * len(nodes)
+    visited = bytearray(len(nodes))
+    visited[start] = 1
+    
+    queue = deque([start])
     visited_count = 0
     visited_order = []
     
     while queue:
         current = queue.popleft()
+        node = nodes[current]
         visited_count += 1
-        visited_order.append((current.x, current.y, current.z))
+        visited_order.append((node.x, node.y, node.z))
         
         # Check if goal reached
-        if current == goal_node:
-            path = reconstruct_path(current)
+        if current == goal:
+            path = reconstruct_path(parents, nodes, current)
             return path, visited_count, len(visited_order), visited_order
         
         # Explore neighbors
-        for neighbor in maze.get_neighbors(current):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                neighbor.parent = current
+        walls = node.walls
+        for step, bit in steps:
+            if walls & bit:
+                continue
+            neighbor = current + step
+            if not visited[neighbor] and not nodes[neighbor].is_wall:
+                visited[neighbor] = 1
+                parents[neighbor] = current
                 queue.append(neighbor)
     
     # No path found
@@ -136,8 +298,30 @@ def bfs(start_node, goal_node, maze):
 
 def dijkstra(start_node, goal_node, maze):
     """
-    Dijkstra's algorithm for pathfinding.
-    Similar to A* but without heuristic (uniform cost search).
+    Dijkstra's algorithm for pathfinding, specialised to this maze.
+    
+    Every corridor step costs 1, so settling nodes in distance order is exactly
+    a breadth-first sweep: this runs bfs, with no heap, and returns the same
+    path, counts and visit order as bfs.
+    
+    Args:
+        start_node: Starting node
+        goal_node: Goal node
+        maze: MazeEngine instance
+    
+    Returns:
+        tuple: (path, nodes_explored, visited_count, visited_order)
+    """
+    return bfs(start_node, goal_node, maze)
+
+
+def bidirectional_search(start_node, goal_node, maze):
+    """
+    Bidirectional BFS: searches from both start and goal simultaneously.
+    Each round expands one full level of whichever frontier is smaller; the
+    search stops after the level in which the two sides first touch, keeping
+    the shortest connection found in that level. Cells count as explored when
+    either side first reaches them, so both searches show up in visited_order.
     
     Args:
         start_node: Starting node
@@ -147,45 +331,67 @@ def dijkstra(start_node, goal_node, maze):
     Returns:
         tuple: (path, nodes_explored, visited_count, visited_order)
     """
-    # Reset pathfinding state
-    maze.reset_pathfinding()
+    nodes = maze.nodes
+    steps = _neighbor_steps(maze)
+    start = _flat_index(maze, start_node)
+    goal = _flat_index(maze, goal_node)
     
-    # Initialize start node
-    start_node.distance = 0
+    if start == goal:
+        return [(start_node.x, start_node.y, start_node.z)], 1, 1, \
+            [(start_node.x, start_node.y, start_node.z)]
     
-    # Priority queue: (distance, unique_id, node)
-    pq = []
-    heapq.heappush(pq, (0, id(start_node), start_node))
+    # Which side reached each cell (0 = neither, 1 = from start, 2 = from goal),
+    # plus parent and BFS depth on that side
+    owner = bytearray(len(nodes))
+    parents = [-1] * len(nodes)
+    depth = [0] * len(nodes)
+    owner[start] = 1
+    owner[goal] = 2
+    frontiers = {1: [start], 2: [goal]}
     
-    visited = set()
-    visited_count = 0
-    visited_order = []
+    visited_order = [(start_node.x, start_node.y, start_node.z),
+                      (goal_node.x, goal_node.y, goal_node.z)]
+    visited_count = 2
     
-    while pq:
-        current_distance, _, current = heapq.heappop(pq)
+    while frontiers[1] and frontiers[2]:
+        side = 1 if len(frontiers[1]) <= len(frontiers[2]) else 2
+        other = 3 - side
+        best = None
+        next_level = []
         
-        # Skip if already visited
-        if current in visited:
-            continue
-        
-        visited.add(current)
-        visited_count += 1
-        visited_order.append((current.x, current.y, current.z))
+        for current in frontiers[side]:
+            # Explore neighbors
+            walls = nodes[current].walls
+            for step, bit in steps:
+                if walls & bit:
+                    continue
+                neighbor = current + step
+                reached_by = owner[neighbor]
+                
+                if reached_by == 0:
+                    neighbor_node = nodes[neighbor]
+                    if not neighbor_node.is_wall:
+                        visited_count += 1
+                        visited_order.append((neighbor_node.x, neighbor_node.y, neighbor_node.z))
+                        owner[neighbor] = side
+                        parents[neighbor] = current
+                        depth[neighbor] = depth[current] + 1
+                        next_level.append(neighbor)
+                elif reached_by == other:
+                    # The two searches meet across this edge
+                    length = depth[current] + depth[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, current, neighbor)
         
-        # Check if goal reached
-        if current == goal_node:
-            path = reconstruct_path(current)
+        if best is not None:
+            _, near, far = best
+            from_start, from_goal = (near, far) if side == 1 else (far, near)
+            # Goal-side parents already run from the meeting point to the goal
+            path = reconstruct_path(parents, nodes, from_start)
+            path += _walk_parents(parents, nodes, from_goal)
             return path, visited_count, len(visited_order), visited_order
         
-        # Explore neighbors
-        for neighbor in maze.get_neighbors(current):
-            if neighbor not in visited:
-                new_distance = current_distance + 1
-                
-                if new_distance < neighbor.distance:
-                    neighbor.distance = new_distance
-                    neighbor.parent = current
-                    heapq.heappush(pq, (new_distance, id(neighbor), neighbor))
+        frontiers[side] = next_level
     
     # No path found
     return None, visited_count, len(visited_order), visited_order
@@ -195,7 +401,8 @@ def dijkstra(start_node, goal_node, maze):
 ALGORITHMS = {
     'a_star': a_star,
     'bfs': bfs,
-    'dijkstra': dijkstra
+    'dijkstra': dijkstra,
+    'bi_bfs': bidirectional_search
 }
 
 
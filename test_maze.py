@@ -6,6 +6,9 @@ Run this file to verify all components work correctly.
 from maze_engines import MazeEngine
 from pathfinders import a_star, bfs, dijkstra, bidirectional_search
 from analytics import Analytics
+import math
+import random
+import statistics
 import time
 
 
@@ -78,6 +81,280 @@ def test_pathfinding(engine):
     
     return results
 
+def test_bidirectional_counts():
+    """Bidirectional BFS counts cells reached from both sides"""
+    print("\n🧪 Testing Bidirectional BFS Counts...")
+    
+    engine = MazeEngine(8, 8, 8)
+    engine.generate_maze(seed=0)
+    
+    # Adjacent cells: the searches meet after one expansion
+    start = engine.grid[0][0][0]
+    neighbor = engine.get_neighbors(start)[0]
+    path, count, v_len, order = bidirectional_search(start, neighbor, engine)
+    assert len(path) == 2
+    assert v_len == 2 and set(order) == {path[0], path[1]}
+    
+    # Every path cell was reached by one side, so explored >= path length
+    for x, y, z in [(7, 7, 7), (0, 7, 0), (3, 4, 5)]:
+        goal = engine.grid[x][y][z]
+        path, count, v_len, order = bidirectional_search(start, goal, engine)
+        assert v_len >= len(path), (v_len, len(path))
+        assert set(path) <= set(order)
+    
+    print("   ✅ Explored count covers both searches")
+
+
+def test_outer_walls_sealed():
+    """Outer walls stay closed, so searches never step off the grid"""
+    print("\n🧪 Testing Outer Walls...")
+    
+    from node import NORTH, EAST
+    
+    engine = MazeEngine(3, 3, 3)
+    engine.generate_maze(seed=0)
+    packed = engine.walls_packed.copy()
+    
+    # Clear outer wall bits directly, then re-pack as documented
+    engine.grid[0][0][2].walls &= ~NORTH
+    engine.grid[2][2][2].walls &= ~EAST
+    engine.refresh_walls()
+    assert engine.grid[0][0][2].walls & NORTH and engine.grid[2][2][2].walls & EAST
+    assert (engine.walls_packed == packed).all()
+    
+    for start, goal in [((0, 0, 2), (0, 1, 0)), ((2, 2, 2), (0, 0, 0))]:
+        path, count, v_len, order = bfs(engine.grid[start[0]][start[1]][start[2]],
+                                        engine.grid[goal[0]][goal[1]][goal[2]], engine)
+        for a, b in zip(path, path[1:]):
+            assert sum(abs(p - q) for p, q in zip(a, b)) == 1, (a, b)
+    
+    print("   ✅ Outer walls re-closed; paths only take unit steps")
+
+
+def test_seeded_generation():
+    """The same seed gives the same maze; a different seed gives another"""
+    print("\n🧪 Testing Seeded Generation...")
+    
+    for algorithm in ("recursive_backtracking", "kruskal"):
+        packed = []
+        for seed in (42, 42, 43):
+            engine = MazeEngine(6, 7, 8)
+            engine.generate_maze(algorithm=algorithm, seed=seed)
+            packed.append(engine.walls_packed.copy())
+        assert (packed[0] == packed[1]).all(), algorithm
+        assert (packed[0] != packed[2]).any(), algorithm
+        
+        # Regenerating an engine in place gives the same maze as a fresh one
+        engine.generate_maze(algorithm=algorithm, seed=42)
+        assert (engine.walls_packed == packed[0]).all(), algorithm
+        
+        # A perfect maze is a spanning tree: one opening fewer than cells
+        stats = engine.get_maze_stats()
+        assert stats['total_openings'] == stats['total_cells'] - 1
+    
+    print("   ✅ Seeded mazes are reproducible")
+
+
+def test_wall_edits_sync():
+    """remove_wall and refresh_walls keep walls_packed and stats in step with nodes"""
+    print("\n🧪 Testing Wall Edit Sync...")
+    
+    from node import DIRECTION_BITS, OPPOSITE
+    
+    engine = MazeEngine(5, 5, 5)
+    engine.generate_maze(seed=3)
+    walls = engine.get_maze_stats()['total_walls']
+    
+    # remove_wall: packed bytes and cached stats follow each opened wall
+    rng = random.Random(3)
+    opened = 0
+    while opened < 10:
+        node = rng.choice(engine.nodes)
+        neighbor = engine.get_node(node.x + 1, node.y, node.z)
+        if neighbor is not None and node.has_wall_to(neighbor):
+            engine.remove_wall(node, neighbor)
+            opened += 1
+            assert (engine.walls_packed == engine.pack_walls()).all()
+    assert engine.get_maze_stats()['total_walls'] == walls - opened
+    
+    # Direct Node.walls edits show up after refresh_walls: close the last wall again
+    bit = DIRECTION_BITS[(1, 0, 0)]
+    node.walls |= bit
+    neighbor.walls |= OPPOSITE[bit]
+    engine.refresh_walls()
+    assert (engine.walls_packed == engine.pack_walls()).all()
+    assert engine.get_maze_stats()['total_walls'] == walls - opened + 1
+    
+    print("   ✅ Wall edits reflected in walls_packed and maze stats")
+
+
+def test_wireframe_segments():
+    """Vectorized wireframe draws the same segments as a per-cell walk"""
+    print("\n🧪 Testing Maze Wireframe...")
+    
+    from node import WALL_BITS
+    from voxel_visualizer import create_maze_wireframe
+    
+    def reference(engine):
+        """Boundary grid plus the four edges of every internal east/north/up wall"""
+        w, h, d = engine.width, engine.height, engine.depth
+        segments = []
+        for y in (0, h):
+            segments += [((x, y, 0), (x, y, d)) for x in range(w + 1)]
+            segments += [((0, y, z), (w, y, z)) for z in range(d + 1)]
+        segments += [((x, 0, z), (x, h, z)) for x in (0, w) for z in (0, d)]
+        for node in engine.nodes:
+            x, y, z = node.x, node.y, node.z
+            if node.walls & WALL_BITS['east'] and x < w - 1:
+                segments += [((x + 1, y, z), (x + 1, y + 1, z)), ((x + 1, y, z + 1), (x + 1, y + 1, z + 1)),
+                             ((x + 1, y, z), (x + 1, y, z + 1)), ((x + 1, y + 1, z), (x + 1, y + 1, z + 1))]
+            if node.walls & WALL_BITS['north'] and z < d - 1:
+                segments += [((x, y, z + 1), (x, y + 1, z + 1)), ((x + 1, y, z + 1), (x + 1, y + 1, z + 1)),
+                             ((x, y, z + 1), (x + 1, y, z + 1)), ((x, y + 1, z + 1), (x + 1, y + 1, z + 1))]
+            if node.walls & WALL_BITS['up'] and y < h - 1:
+                segments += [((x, y + 1, z), (x + 1, y + 1, z)), ((x, y + 1, z + 1), (x + 1, y + 1, z + 1)),
+                             ((x, y + 1, z), (x, y + 1, z + 1)), ((x + 1, y + 1, z), (x + 1, y + 1, z + 1))]
+        return sorted(tuple(sorted(segment)) for segment in segments)
+    
+    for dims, algorithm in [((3, 4, 5), "recursive_backtracking"), ((6, 6, 6), "kruskal"),
+                            ((1, 2, 1), "recursive_backtracking")]:
+        engine = MazeEngine(*dims)
+        engine.generate_maze(algorithm=algorithm, seed=0)
+        wx, wy, wz = create_maze_wireframe(engine)
+        
+        # Every segment is start, end, NaN gap
+        assert len(wx) % 3 == 0
+        points = list(zip(wx.tolist(), wy.tolist(), wz.tolist()))
+        assert all(math.isnan(p[0]) for p in points[2::3])
+        drawn = sorted(tuple(sorted((tuple(map(int, a)), tuple(map(int, b)))))
+                       for a, b in zip(points[0::3], points[1::3]))
+        assert drawn == reference(engine), dims
+    
+    print("   ✅ Wireframe segments match the per-cell reference")
+
+
+def _looped_maze(seed, size=6, extra_openings=40):
+    """Seeded maze with extra walls opened, so cells have several routes between them"""
+    engine = MazeEngine(size, size, size)
+    engine.generate_maze(algorithm="recursive_backtracking" if seed % 2 else "kruskal", seed=seed)
+    rng = random.Random(seed)
+    for _ in range(extra_openings):
+        node = rng.choice(engine.nodes)
+        candidates = [engine.get_node(node.x + dx, node.y + dy, node.z + dz)
+                      for dx, dy, dz in ((1, 0, 0), (0, 1, 0), (0, 0, 1))]
+        closed = [n for n in candidates if n is not None and node.has_wall_to(n)]
+        if closed:
+            engine.remove_wall(node, rng.choice(closed))
+    return engine, rng
+
+
+def _shortest_length(engine, start, goal):
+    """Cells on a shortest path, by a plain BFS over bounds-checked neighbors"""
+    depth = {start: 1}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for node in frontier:
+            if node is goal:
+                return depth[node]
+            for neighbor in engine.get_neighbors(node):
+                if neighbor not in depth:
+                    depth[neighbor] = depth[node] + 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return None
+
+
+def _check_shortest(engine, search, name, start, goal, expected):
+    """Assert `search` returns a valid start-to-goal path of the expected length"""
+    path, count, v_len, order = search(start, goal, engine)
+    assert path[0] == (start.x, start.y, start.z), name
+    assert path[-1] == (goal.x, goal.y, goal.z), name
+    assert len(path) == expected, (name, len(path), expected)
+    for a, b in zip(path, path[1:]):
+        assert not engine.get_node(*a).has_wall_to(engine.get_node(*b)), (name, a, b)
+
+
+def test_flat_index_searches():
+    """Flat-index BFS and bidirectional BFS find shortest paths on looped mazes"""
+    print("\n🧪 Testing Flat-Index Searches...")
+    
+    for seed in range(20):
+        engine, rng = _looped_maze(seed)
+        start, goal = rng.choice(engine.nodes), rng.choice(engine.nodes)
+        expected = _shortest_length(engine, start, goal)
+        _check_shortest(engine, bfs, "BFS", start, goal, expected)
+        _check_shortest(engine, bidirectional_search, "Bidirectional BFS", start, goal, expected)
+    
+    print("   ✅ BFS and bidirectional BFS match a reference BFS")
+
+
+def test_bucket_searches():
+    """Bucket-queue A* (integer heuristics) and Dijkstra find shortest paths"""
+    print("\n🧪 Testing Bucket-Queue Searches...")
+    
+    searches = [
+        ("A* (Manhattan)", lambda s, g, e: a_star(s, g, e, heuristic="manhattan")),
+        ("A* (Chebyshev)", lambda s, g, e: a_star(s, g, e, heuristic="chebyshev")),
+        ("Dijkstra", dijkstra),
+    ]
+    for seed in range(20):
+        engine, rng = _looped_maze(seed)
+        start, goal = rng.choice(engine.nodes), rng.choice(engine.nodes)
+        expected = _shortest_length(engine, start, goal)
+        for name, search in searches:
+            _check_shortest(engine, search, name, start, goal, expected)
+    
+    print("   ✅ Bucket A* and Dijkstra match a reference BFS")
+
+
+def test_heap_a_star():
+    """Heap-based A* (lazy deletion) finds shortest paths with a float heuristic"""
+    print("\n🧪 Testing Heap A*...")
+    
+    # Enough side routes that an overweighted (inadmissible) heuristic would
+    # settle for a longer one
+    for seed in range(20):
+        engine, rng = _looped_maze(seed, extra_openings=100)
+        start, goal = rng.choice(engine.nodes), rng.choice(engine.nodes)
+        expected = _shortest_length(engine, start, goal)
+        _check_shortest(engine, lambda s, g, e: a_star(s, g, e, heuristic="euclidean"),
+                        "A* (Euclidean)", start, goal, expected)
+        
+        # Re-running on the same engine gives the same path: no state leaks between searches
+        assert a_star(start, goal, engine, heuristic="euclidean")[0] == \
+            a_star(start, goal, engine, heuristic="euclidean")[0]
+    
+    print("   ✅ Heap A* matches a reference BFS")
+
+
+def test_heuristic_tables():
+    """Vectorized heuristic tables match the scalar distance helpers"""
+    print("\n🧪 Testing Heuristic Tables...")
+    
+    from maze_utils import manhattan_distance_3d, euclidean_distance_3d, chebyshev_distance_3d
+    from pathfinders import HEURISTICS, INTEGER_HEURISTICS, _heuristic_table
+    
+    scalar = {
+        'manhattan': manhattan_distance_3d,
+        'euclidean': euclidean_distance_3d,
+        'chebyshev': chebyshev_distance_3d
+    }
+    assert set(HEURISTICS) == set(scalar)
+    
+    engine = MazeEngine(4, 5, 6)
+    for goal in (engine.grid[0][0][0], engine.grid[3][4][5], engine.grid[2][1][4]):
+        for name, distance in scalar.items():
+            table = _heuristic_table(engine, goal, name)
+            assert len(table) == len(engine.nodes)
+            for value, node in zip(table, engine.nodes):
+                assert math.isclose(value, distance(node, goal)), (name, node.x, node.y, node.z)
+                # Bucket A* indexes lists with these, so they must be plain ints
+                if name in INTEGER_HEURISTICS:
+                    assert type(value) is int, name
+    
+    print("   ✅ Tables match manhattan, euclidean and chebyshev helpers")
+
 
 def test_analytics(results):
     """Test analytics functionality"""
@@ -114,24 +391,175 @@ def test_analytics(results):
     return analytics
 
 
+def test_bst_balance():
+    """AVL rotations keep the tree logarithmic even for sorted inserts"""
+    print("\n🧪 Testing BST Balance...")
+    
+    analytics = Analytics()
+    n = 1000
+    for i in range(n):
+        analytics.insert_into_bst(float(i), "Sorted")
+    
+    # AVL height bound: h < 1.4405 * log2(n + 2)
+    height = analytics.path_history_tree.height
+    assert height < 1.4405 * math.log2(n + 2), height
+    
+    # Every node's recorded height matches its subtrees and they differ by at most 1
+    def check(node):
+        if node is None:
+            return 0
+        left, right = check(node.left), check(node.right)
+        assert abs(left - right) <= 1 and node.height == 1 + max(left, right)
+        return node.height
+    
+    check(analytics.path_history_tree)
+    
+    print(f"   ✅ Height {height} for {n} sorted inserts")
+
+
+def test_leaderboard_order():
+    """Leaderboard lists distinct durations fastest first, with repeat counts"""
+    print("\n🧪 Testing Leaderboard Order...")
+    
+    rng = random.Random(0)
+    durations = [rng.uniform(1, 100) for _ in range(200)] + [5.0, 5.0, 5.0]
+    analytics = Analytics()
+    for duration in durations:
+        analytics.insert_into_bst(duration, "Random")
+    
+    unique = sorted(set(durations))
+    leaderboard = analytics.get_leaderboard(limit=10)
+    assert [entry['duration'] for entry in leaderboard] == unique[:10]
+    
+    full = analytics.get_leaderboard(limit=len(unique))
+    assert [entry['duration'] for entry in full] == unique
+    assert sum(entry['count'] for entry in full) == len(durations)
+    assert next(e for e in full if e['duration'] == 5.0)['count'] == 3
+    assert analytics.find_fastest_run()['duration'] == unique[0]
+    assert analytics.find_slowest_run()['duration'] == unique[-1]
+    
+    print("   ✅ Leaderboard sorted, duplicates counted")
+
+
+def test_running_statistics():
+    """Incremental run statistics agree with the statistics module"""
+    print("\n🧪 Testing Running Statistics...")
+    
+    rng = random.Random(1)
+    analytics = Analytics()
+    durations = []
+    # More runs than the initial buffer capacity, so the columns grow
+    for i in range(150):
+        duration = rng.uniform(0.5, 500)
+        durations.append(duration)
+        analytics.insert_into_bst(duration, f"Algo {i % 3}")
+        
+        stats = analytics.get_statistics()
+        assert stats['total_runs'] == len(durations)
+        assert math.isclose(stats['mean_duration'], statistics.mean(durations))
+        assert math.isclose(stats['median_duration'], statistics.median(durations))
+        expected_stdev = statistics.stdev(durations) if len(durations) > 1 else 0
+        assert math.isclose(stats['stdev_duration'], expected_stdev, abs_tol=1e-9)
+        assert stats['min_duration'] == min(durations)
+        assert stats['max_duration'] == max(durations)
+    assert stats['algorithms_used'] == 3
+    
+    print("   ✅ Mean, median, stdev, min and max match")
+
+
+def test_export_runs():
+    """Exported runs keep insertion order and the caller's metadata as given"""
+    print("\n🧪 Testing Run Export...")
+    
+    analytics = Analytics()
+    metadata = [{'extra': 'x'}, {'path_length': 5.7}, {}, None,
+                {'nodes_explored': 3, 'path_length': 2}]
+    runs = [(float(i), f"Algo {i % 2}", metadata[i % len(metadata)]) for i in range(100)]
+    for duration, algorithm, meta in runs:
+        analytics.insert_into_bst(duration, algorithm, meta)
+    
+    exported = analytics.export_data()['all_runs']
+    assert [(r['duration'], r['algorithm'], r['metadata']) for r in exported] == runs
+    
+    print("   ✅ Runs and metadata round-trip through export_data")
+
+
+def test_algorithm_summary():
+    """Grouped per-algorithm summary matches a direct per-run computation"""
+    print("\n🧪 Testing Algorithm Summary...")
+    
+    rng = random.Random(2)
+    analytics = Analytics()
+    runs = {}
+    for _ in range(120):
+        algorithm = rng.choice(["A*", "BFS", "Bidirectional BFS"])
+        duration = rng.uniform(0.1, 50)
+        metadata = rng.choice([None, {'nodes_explored': rng.randint(1, 500),
+                                      'path_length': rng.randint(1, 60)}])
+        analytics.insert_into_bst(duration, algorithm, metadata)
+        runs.setdefault(algorithm, []).append((duration, metadata or {}))
+    
+    summary = analytics.get_algorithm_summary()
+    assert set(summary) == set(runs)
+    for algorithm, algo_runs in runs.items():
+        durations = [duration for duration, _ in algo_runs]
+        stats = summary[algorithm]
+        assert stats['runs'] == len(algo_runs)
+        assert math.isclose(stats['avg_time'], statistics.mean(durations))
+        assert stats['best_time'] == min(durations)
+        assert stats['worst_time'] == max(durations)
+        # Runs without metadata count as 0 towards the averages
+        assert math.isclose(stats['avg_nodes_explored'],
+                            sum(m.get('nodes_explored', 0) for _, m in algo_runs) / len(algo_runs))
+        assert math.isclose(stats['avg_path_length'],
+                            sum(m.get('path_length', 0) for _, m in algo_runs) / len(algo_runs))
+    
+    print("   ✅ Per-algorithm runs, times and averages match")
+
+
+def test_solved_memo_cap():
+    """Solved-query memo keeps only the most recently used entries"""
+    print("\n🧪 Testing Solved Query Memo...")
+    
+    from analytics import _SOLVED_MAZE_LIMIT
+    
+    analytics = Analytics()
+    for key in range(3 * _SOLVED_MAZE_LIMIT):
+        analytics.store_solved(key, (key,))
+    assert len(analytics.solved_mazes) == _SOLVED_MAZE_LIMIT
+    oldest = 2 * _SOLVED_MAZE_LIMIT
+    assert list(analytics.solved_mazes) == list(range(oldest, 3 * _SOLVED_MAZE_LIMIT))
+    
+    # A hit moves the entry to the back, so the next store evicts another one
+    assert analytics.get_solved(oldest) == (oldest,)
+    analytics.store_solved('new', ('new',))
+    assert oldest in analytics.solved_mazes and oldest + 1 not in analytics.solved_mazes
+    assert analytics.get_solved(oldest + 1) is None
+    
+    analytics.clear_data()
+    assert analytics.solved_mazes == {}
+    
+    print(f"   ✅ Memo capped at {_SOLVED_MAZE_LIMIT} entries, least recently used evicted")
+
+
 def test_node_functionality():
     """Test Node class functionality"""
     print("\n🧪 Testing Node Functionality...")
     
-    from node import Node
+    from node import Node, WALL_BITS
     
     # Create test nodes
     node1 = Node(0, 0, 0)
     node2 = Node(1, 0, 0)  # East neighbor
     
     print("\n1️⃣ Testing wall connectivity:")
-    print(f"   Initial walls for node1: {sum(node1.walls.values())} walls")
+    print(f"   Initial walls for node1: {bin(node1.walls).count('1')} walls")
     
     # Remove wall between nodes
     node1.remove_wall_to(node2)
-    print(f"   After removing wall: {sum(node1.walls.values())} walls")
-    print(f"   Wall to east: {node1.walls['east']}")
-    print(f"   Neighbor wall to west: {node2.walls['west']}")
+    print(f"   After removing wall: {bin(node1.walls).count('1')} walls")
+    print(f"   Wall to east: {bool(node1.walls & WALL_BITS['east'])}")
+    print(f"   Neighbor wall to west: {bool(node2.walls & WALL_BITS['west'])}")
     
     # Test wall checking
     has_wall = node1.has_wall_to(node2)
@@ -165,10 +593,25 @@ def run_comprehensive_test():
     
     # Test Pathfinding
     results = test_pathfinding(engine)
+    test_bidirectional_counts()
+    test_outer_walls_sealed()
+    test_seeded_generation()
+    test_wall_edits_sync()
+    test_wireframe_segments()
+    test_flat_index_searches()
+    test_bucket_searches()
+    test_heap_a_star()
+    test_heuristic_tables()
     
     # Test Analytics
     if results:
         analytics = test_analytics(results)
+    test_bst_balance()
+    test_leaderboard_order()
+    test_running_statistics()
+    test_export_runs()
+    test_algorithm_summary()
+    test_solved_memo_cap()
     
     print("\n" + "="*80)
     print(" "*25 + "✅ ALL TESTS PASSED! ✅")
@@ -5,6 +5,27 @@ Renders walls as wireframe cubes and shows smooth path animations.
 
 import plotly.graph_objects as go
 import numpy as np
+from node import WALL_BITS
+
+# Explored-node markers beyond this are thinned out before plotting
+MAX_VISITED_POINTS = 5000
+
+# Unit box corners (bottom face then top face) and the triangles covering it,
+# shared by the mesh helpers below; read-only since every call returns them
+CUBE_CORNERS = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+])
+CUBE_FACES = np.array([
+    [0, 1, 2], [0, 2, 3],  # bottom
+    [4, 5, 6], [4, 6, 7],  # top
+    [0, 1, 5], [0, 5, 4],  # front
+    [2, 3, 7], [2, 7, 6],  # back
+    [0, 3, 7], [0, 7, 4],  # left
+    [1, 2, 6], [1, 6, 5],  # right
+])
+CUBE_CORNERS.flags.writeable = False
+CUBE_FACES.flags.writeable = False
 
 
 def create_wireframe_edges(x, y, z, size=1.0):
@@ -39,195 +60,87 @@ def create_cube_mesh(x, y, z, size=0.8):
     """
     Create a 3D solid cube mesh for visualization.
     """
-    s = size / 2
-    vertices = np.array([
-        [x-s, y-s, z-s], [x+s, y-s, z-s], [x+s, y+s, z-s], [x-s, y+s, z-s],
-        [x-s, y-s, z+s], [x+s, y-s, z+s], [x+s, y+s, z+s], [x-s, y+s, z+s],
-    ])
-    
-    faces = np.array([
-        [0, 1, 2], [0, 2, 3],  # bottom
-        [4, 5, 6], [4, 6, 7],  # top
-        [0, 1, 5], [0, 5, 4],  # front
-        [2, 3, 7], [2, 7, 6],  # back
-        [0, 3, 7], [0, 7, 4],  # left
-        [1, 2, 6], [1, 6, 5],  # right
-    ])
-    
-    return vertices, faces
+    vertices = np.array([x, y, z]) + CUBE_CORNERS * (size / 2)
+    return vertices, CUBE_FACES
 
 
-def create_wall_between_cells(x1, y1, z1, x2, y2, z2, thickness=0.08):
+def _face_edges(cells, normal, u, v):
     """
-    Create a wall mesh between two adjacent cells.
+    Edges of the unit square face on the `normal` side of each cell in `cells`.
+    The face spans the `u` and `v` axes; returns (starts, ends), each (4k, 3).
     """
-    # Calculate the midpoint
-    mx, my, mz = (x1 + x2) / 2, (y1 + y2) / 2, (z1 + z2) / 2
-    
-    # Determine wall orientation
-    dx, dy, dz = x2 - x1, y2 - y1, z2 - z1
-    
-    t = thickness / 2
-    s = 0.45  # Half the cell size
-    
-    if dx != 0:  # Wall perpendicular to X axis
-        vertices = np.array([
-            [mx-t, my-s, mz-s], [mx+t, my-s, mz-s],
-            [mx+t, my+s, mz-s], [mx-t, my+s, mz-s],
-            [mx-t, my-s, mz+s], [mx+t, my-s, mz+s],
-            [mx+t, my+s, mz+s], [mx-t, my+s, mz+s],
-        ])
-    elif dy != 0:  # Wall perpendicular to Y axis
-        vertices = np.array([
-            [mx-s, my-t, mz-s], [mx+s, my-t, mz-s],
-            [mx+s, my+t, mz-s], [mx-s, my+t, mz-s],
-            [mx-s, my-t, mz+s], [mx+s, my-t, mz+s],
-            [mx+s, my+t, mz+s], [mx-s, my+t, mz+s],
-        ])
-    else:  # Wall perpendicular to Z axis
-        vertices = np.array([
-            [mx-s, my-s, mz-t], [mx+s, my-s, mz-t],
-            [mx+s, my+s, mz-t], [mx-s, my+s, mz-t],
-            [mx-s, my-s, mz+t], [mx+s, my-s, mz+t],
-            [mx+s, my+s, mz+t], [mx-s, my+s, mz+t],
-        ])
-    
-    faces = np.array([
-        [0, 1, 2], [0, 2, 3],
-        [4, 5, 6], [4, 6, 7],
-        [0, 1, 5], [0, 5, 4],
-        [2, 3, 7], [2, 7, 6],
-        [0, 3, 7], [0, 7, 4],
-        [1, 2, 6], [1, 6, 5],
-    ])
-    
-    return vertices, faces
+    p0 = cells + normal
+    starts = np.concatenate([p0, p0 + v, p0, p0 + u])
+    ends = np.concatenate([p0 + u, p0 + v + u, p0 + v, p0 + u + v])
+    return starts, ends
 
 
 def create_maze_wireframe(engine):
     """
     Create wireframe visualization for the maze structure.
     Shows walls as lines forming corridors - making it look like a real maze.
-    """
-    all_x, all_y, all_z = [], [], []
     
-    # Draw boundary walls
+    Internal walls are read from the engine's packed wall array, so the grid
+    is scanned with NumPy masks instead of a Python loop over every cell.
+    That array must be current: edit walls through engine.remove_wall, or
+    call engine.refresh_walls() after changing Node.walls directly.
+    Returns x, y, z float32 arrays with NaN separating the line segments.
+    """
     w, h, d = engine.width, engine.height, engine.depth
+    starts, ends = [], []
     
-    # Floor and ceiling grids
-    for x in range(w + 1):
-        # Bottom floor lines (front-back)
-        all_x.extend([x, x, None])
-        all_y.extend([0, 0, None])
-        all_z.extend([0, d, None])
-        # Top ceiling lines
-        all_x.extend([x, x, None])
-        all_y.extend([h, h, None])
-        all_z.extend([0, d, None])
-    
-    for z in range(d + 1):
-        # Bottom floor lines (left-right)
-        all_x.extend([0, w, None])
-        all_y.extend([0, 0, None])
-        all_z.extend([z, z, None])
-        # Top ceiling lines
-        all_x.extend([0, w, None])
-        all_y.extend([h, h, None])
-        all_z.extend([z, z, None])
+    # Floor and ceiling grids, both levels at once
+    levels = np.array([0, h])
+    # Front-back lines
+    xs, ys = (a.ravel() for a in np.meshgrid(np.arange(w + 1), levels))
+    starts.append(np.column_stack([xs, ys, np.zeros_like(xs)]))
+    ends.append(np.column_stack([xs, ys, np.full_like(xs, d)]))
+    # Left-right lines
+    zs, ys = (a.ravel() for a in np.meshgrid(np.arange(d + 1), levels))
+    starts.append(np.column_stack([np.zeros_like(zs), ys, zs]))
+    ends.append(np.column_stack([np.full_like(zs, w), ys, zs]))
     
     # Vertical corner edges
-    for x in [0, w]:
-        for z in [0, d]:
-            all_x.extend([x, x, None])
-            all_y.extend([0, h, None])
-            all_z.extend([z, z, None])
-    
-    # Draw internal walls based on maze structure
-    for x in range(engine.width):
-        for y in range(engine.height):
-            for z in range(engine.depth):
-                node = engine.grid[x][y][z]
-                
-                # Check for walls in each direction and draw them
-                # East wall (between x and x+1)
-                if node.walls.get('east', False) and x < engine.width - 1:
-                    # Draw vertical line at x+0.5
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y, y + 1, None])
-                    all_z.extend([z, z, None])
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y, y + 1, None])
-                    all_z.extend([z + 1, z + 1, None])
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y, y, None])
-                    all_z.extend([z, z + 1, None])
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z, z + 1, None])
-                
-                # North wall (between z and z+1)
-                if node.walls.get('north', False) and z < engine.depth - 1:
-                    all_x.extend([x, x, None])
-                    all_y.extend([y, y + 1, None])
-                    all_z.extend([z + 1, z + 1, None])
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y, y + 1, None])
-                    all_z.extend([z + 1, z + 1, None])
-                    all_x.extend([x, x + 1, None])
-                    all_y.extend([y, y, None])
-                    all_z.extend([z + 1, z + 1, None])
-                    all_x.extend([x, x + 1, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z + 1, z + 1, None])
-                
-                # Up wall (between y and y+1)
-                if node.walls.get('up', False) and y < engine.height - 1:
-                    all_x.extend([x, x + 1, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z, z, None])
-                    all_x.extend([x, x + 1, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z + 1, z + 1, None])
-                    all_x.extend([x, x, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z, z + 1, None])
-                    all_x.extend([x + 1, x + 1, None])
-                    all_y.extend([y + 1, y + 1, None])
-                    all_z.extend([z, z + 1, None])
-    
-    return all_x, all_y, all_z
+    corners = np.array([(x, 0, z) for x in (0, w) for z in (0, d)])
+    starts.append(corners)
+    ends.append(corners + (0, h, 0))
+    
+    # Internal walls; the boundary faces are already covered above
+    walls = engine.walls_packed if engine.walls_packed is not None else engine.pack_walls()
+    east = np.argwhere(walls[:-1, :, :] & WALL_BITS['east'])    # between x and x+1
+    north = np.argwhere(walls[:, :, :-1] & WALL_BITS['north'])  # between z and z+1
+    up = np.argwhere(walls[:, :-1, :] & WALL_BITS['up'])        # between y and y+1
+    for cells, normal, u, v in (
+        (east, (1, 0, 0), (0, 1, 0), (0, 0, 1)),
+        (north, (0, 0, 1), (0, 1, 0), (1, 0, 0)),
+        (up, (0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    ):
+        s, e = _face_edges(cells, np.array(normal), np.array(u), np.array(v))
+        starts.append(s)
+        ends.append(e)
+    
+    # Interleave start, end, gap for each segment; corners are small integers,
+    # exact in float32, which halves the arrays sent to the browser
+    starts = np.concatenate(starts)
+    points = np.full((len(starts), 3, 3), np.nan, dtype=np.float32)
+    points[:, 0] = starts
+    points[:, 1] = np.concatenate(ends)
+    points = points.reshape(-1, 3)
+    
+    return points[:, 0], points[:, 1], points[:, 2]
 
 
-def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None, 
-                                    start=None, goal=None, title="3D Maze Pathfinding",
-                                    show_walls=True, wall_opacity=0.3, wall_color='gray',
-                                    animation_progress=1.0, show_path_animation=False):
+def _build_static_traces(engine, start=None, goal=None, show_walls=True, wireframe=None):
     """
-    Create an enhanced 3D maze visualization with wireframe walls and smooth animations.
-    
-    Args:
-        engine: MazeEngine instance
-        visited_nodes: List of (x,y,z) tuples for explored nodes
-        final_path: List of (x,y,z) tuples for the solution path
-        start: (x,y,z) tuple for start position
-        goal: (x,y,z) tuple for goal position
-        title: Plot title
-        show_walls: Whether to render walls
-        wall_opacity: Opacity of walls
-        wall_color: Color of walls
-        animation_progress: 0-1 value for path animation progress
-        show_path_animation: Whether to animate the path line
-    
-    Returns:
-        Plotly Figure object
+    Traces that stay fixed for a maze across renders: walls, start and goal.
     """
-    fig = go.Figure()
+    traces = []
     
     # Create wireframe maze structure
     if show_walls:
-        wx, wy, wz = create_maze_wireframe(engine)
+        wx, wy, wz = wireframe if wireframe is not None else create_maze_wireframe(engine)
         
-        fig.add_trace(go.Scatter3d(
+        traces.append(go.Scatter3d(
             x=wx, y=wy, z=wz,
             mode='lines',
             line=dict(color='rgba(100, 100, 120, 0.6)', width=2),
@@ -236,19 +149,65 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
             hoverinfo='skip'
         ))
     
+    # Mark start position with a distinctive marker
+    if start:
+        traces.append(go.Scatter3d(
+            x=[start[0]], y=[start[1]], z=[start[2]],
+            mode='markers',
+            marker=dict(
+                size=14, 
+                color='#00FF7F',
+                symbol='diamond',
+                line=dict(color='#006400', width=3)
+            ),
+            name='Start',
+            showlegend=True
+        ))
+    
+    # Mark goal position with a distinctive marker
+    if goal:
+        traces.append(go.Scatter3d(
+            x=[goal[0]], y=[goal[1]], z=[goal[2]],
+            mode='markers',
+            marker=dict(
+                size=14, 
+                color='#FF4500',
+                symbol='diamond',
+                line=dict(color='#8B0000', width=3)
+            ),
+            name='Goal',
+            showlegend=True
+        ))
+    
+    return traces
+
+
+def _build_dynamic_traces(visited_nodes=None, final_path=None,
+                          animation_progress=1.0, show_path_animation=False,
+                          max_points=MAX_VISITED_POINTS):
+    """
+    Traces that change per search result: explored nodes and the solution path.
+    Explored nodes are evenly sampled down to at most max_points markers.
+    """
+    traces = []
+    
     # Draw visited nodes with gradient coloring based on visit order
-    if visited_nodes and len(visited_nodes) > 0:
-        vx, vy, vz = zip(*visited_nodes)
-        # Create color gradient from light orange to deep orange based on visit order
-        colors = [f'rgba(255, {max(100, 200 - i * 2)}, {max(50, 150 - i * 3)}, 0.7)' 
-                  for i in range(len(visited_nodes))]
+    if visited_nodes is not None and len(visited_nodes) > 0:
+        order = np.asarray(visited_nodes)
+        visit_rank = np.arange(len(order))
+        if max_points and len(order) > max_points:
+            # Evenly spaced picks keep the exploration order readable and
+            # always include the first and last node visited
+            keep = np.linspace(0, len(order) - 1, max_points).astype(np.int64)
+            order, visit_rank = order[keep], visit_rank[keep]
+        vx, vy, vz = order[:, 0], order[:, 1], order[:, 2]
         
-        fig.add_trace(go.Scatter3d(
+        traces.append(go.Scatter3d(
             x=vx, y=vy, z=vz,
             mode='markers',
             marker=dict(
                 size=4,
-                color=list(range(len(visited_nodes))),
+                color=visit_rank,  # Gradient along the visit order
                 colorscale='YlOrRd',
                 opacity=0.6,
                 showscale=False
@@ -258,7 +217,7 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
         ))
     
     # Draw the path with animation effect
-    if final_path and len(final_path) > 0:
+    if final_path is not None and len(final_path) > 0:
         # Calculate how much of the path to show based on animation progress
         if show_path_animation:
             path_length = max(1, int(len(final_path) * animation_progress))
@@ -266,24 +225,15 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
         else:
             animated_path = final_path
         
-        px, py, pz = zip(*animated_path)
-        
-        # Draw the main path line with a glowing effect
-        # Outer glow
-        fig.add_trace(go.Scatter3d(
-            x=px, y=py, z=pz,
-            mode='lines',
-            line=dict(color='rgba(0, 150, 255, 0.3)', width=12),
-            name='Path Glow',
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+        animated_path = np.asarray(animated_path)
+        px, py, pz = animated_path[:, 0], animated_path[:, 1], animated_path[:, 2]
         
-        # Main path line
-        fig.add_trace(go.Scatter3d(
+        # Main path line; one wide line instead of a second "glow" trace with
+        # the same coordinates
+        traces.append(go.Scatter3d(
             x=px, y=py, z=pz,
             mode='lines+markers',
-            line=dict(color='#00BFFF', width=6),
+            line=dict(color='#00BFFF', width=10),
             marker=dict(size=4, color='#00BFFF', symbol='circle'),
             name='Solution Path',
             showlegend=True
@@ -292,7 +242,7 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
         # Animated head of the path (current position)
         if show_path_animation and len(animated_path) > 0:
             head = animated_path[-1]
-            fig.add_trace(go.Scatter3d(
+            traces.append(go.Scatter3d(
                 x=[head[0]], y=[head[1]], z=[head[2]],
                 mode='markers',
                 marker=dict(size=10, color='#FFD700', symbol='diamond',
@@ -301,36 +251,13 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
                 showlegend=True
             ))
     
-    # Mark start position with a distinctive marker
-    if start:
-        fig.add_trace(go.Scatter3d(
-            x=[start[0]], y=[start[1]], z=[start[2]],
-            mode='markers',
-            marker=dict(
-                size=14, 
-                color='#00FF7F',
-                symbol='diamond',
-                line=dict(color='#006400', width=3)
-            ),
-            name='Start',
-            showlegend=True
-        ))
-    
-    # Mark goal position with a distinctive marker
-    if goal:
-        fig.add_trace(go.Scatter3d(
-            x=[goal[0]], y=[goal[1]], z=[goal[2]],
-            mode='markers',
-            marker=dict(
-                size=14, 
-                color='#FF4500',
-                symbol='diamond',
-                line=dict(color='#8B0000', width=3)
-            ),
-            name='Goal',
-            showlegend=True
-        ))
-    
+    return traces
+
+
+def _apply_maze_layout(fig, engine, title):
+    """
+    Apply the dark scene layout shared by the maze figures.
+    """
     # Configure layout with dark theme matching the app
     fig.update_layout(
         title=dict(
@@ -380,6 +307,9 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
         plot_bgcolor='rgba(22, 33, 62, 0.95)',
         height=700,
         margin=dict(l=0, r=0, t=60, b=0),
+        # Keep the user's camera and legend state when a new result for the
+        # same maze size replaces the figure data
+        uirevision=f"{engine.width}x{engine.height}x{engine.depth}",
         legend=dict(
             x=0.02, y=0.98,
             bgcolor='rgba(26, 26, 46, 0.9)',
@@ -388,6 +318,144 @@ def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None,
             font=dict(size=11, color='#e0e0e0')
         )
     )
+
+
+def build_static_figure(engine, start=None, goal=None, show_walls=True, wireframe=None,
+                        title="3D Maze Pathfinding"):
+    """
+    Create the per-maze part of the figure: walls, start/goal markers and layout.
+    
+    Result figures clone this (go.Figure(base)) and add their dynamic traces,
+    which skips rebuilding the walls and re-validating the scene layout.
+    """
+    fig = go.Figure(data=_build_static_traces(engine, start, goal, show_walls, wireframe))
+    _apply_maze_layout(fig, engine, title)
+    
+    return fig
+
+
+def _start_figure(engine, start, goal, show_walls, wireframe, title, base_figure):
+    """Clone base_figure when given, otherwise build the static figure from scratch"""
+    if base_figure is None:
+        return build_static_figure(engine, start, goal, show_walls, wireframe, title)
+    
+    fig = go.Figure(base_figure)
+    fig.layout.title.text = title
+    return fig
+
+
+def create_voxel_maze_visualization(engine, visited_nodes=None, final_path=None, 
+                                    start=None, goal=None, title="3D Maze Pathfinding",
+                                    show_walls=True, wall_opacity=0.3, wall_color='gray',
+                                    animation_progress=1.0, show_path_animation=False,
+                                    wireframe=None, max_points=MAX_VISITED_POINTS,
+                                    base_figure=None):
+    """
+    Create an enhanced 3D maze visualization with wireframe walls and smooth animations.
+    
+    Args:
+        engine: MazeEngine instance
+        visited_nodes: (x,y,z) tuples or an (N, 3) array of explored nodes
+        final_path: (x,y,z) tuples or an (N, 3) array for the solution path
+        start: (x,y,z) tuple for start position
+        goal: (x,y,z) tuple for goal position
+        title: Plot title
+        show_walls: Whether to render walls
+        wall_opacity: Opacity of walls
+        wall_color: Color of walls
+        animation_progress: 0-1 value for path animation progress
+        show_path_animation: Whether to animate the path line
+        wireframe: Optional precomputed (x, y, z) from create_maze_wireframe,
+            reused across renders of the same maze
+        max_points: Cap on plotted explored-node markers (None for no cap)
+        base_figure: Optional figure from build_static_figure for the same maze,
+            start, goal and show_walls; cloned instead of rebuilt
+    
+    Returns:
+        Plotly Figure object
+    """
+    fig = _start_figure(engine, start, goal, show_walls, wireframe, title, base_figure)
+    fig.add_traces(_build_dynamic_traces(visited_nodes, final_path,
+                                         animation_progress, show_path_animation, max_points))
+    
+    return fig
+
+
+def create_animated_maze_visualization(engine, visited_nodes=None, final_path=None,
+                                       start=None, goal=None, title="3D Maze Pathfinding",
+                                       show_walls=True, wall_opacity=0.3, wall_color='gray',
+                                       frame_duration=450, wireframe=None,
+                                       max_points=MAX_VISITED_POINTS, base_figure=None):
+    """
+    Create a single figure that plays back the search in the browser.
+    
+    The figure carries three Plotly frames (init, explored, final) and a Play
+    button, so the exploration animation runs client-side instead of the
+    server redrawing the chart between sleeps.
+    
+    Args:
+        engine: MazeEngine instance
+        visited_nodes: (x,y,z) tuples or an (N, 3) array of explored nodes
+        final_path: (x,y,z) tuples or an (N, 3) array for the solution path
+        start: (x,y,z) tuple for start position
+        goal: (x,y,z) tuple for goal position
+        title: Base plot title (stage suffixes are appended per frame)
+        show_walls: Whether to render walls
+        wall_opacity: Opacity of walls
+        wall_color: Color of walls
+        frame_duration: Milliseconds each frame is shown during playback
+        wireframe: Optional precomputed (x, y, z) from create_maze_wireframe
+        max_points: Cap on plotted explored-node markers (None for no cap)
+        base_figure: Optional figure from build_static_figure, cloned instead of rebuilt
+    
+    Returns:
+        Plotly Figure object with frames and a Play button
+    """
+    explored_count = len(visited_nodes) if visited_nodes is not None else 0
+    fig = _start_figure(engine, start, goal, show_walls, wireframe, title, base_figure)
+    static_count = len(fig.data)
+    dynamic = _build_dynamic_traces(visited_nodes, final_path, max_points=max_points)
+    fig.add_traces(dynamic)
+    
+    # Only the exploration and path traces change between frames
+    animated = list(range(static_count, static_count + len(dynamic)))
+    
+    def stage(shown):
+        return [go.Scatter3d(x=trace.x, y=trace.y, z=trace.z) if trace.name in shown
+                else go.Scatter3d(x=[], y=[], z=[])
+                for trace in dynamic]
+    
+    fig.frames = [
+        go.Frame(name='init', data=stage(()), traces=animated,
+                 layout=dict(title=dict(text=title))),
+        go.Frame(name='explored', data=stage(('Explored Nodes',)), traces=animated,
+                 layout=dict(title=dict(text=f"{title} - Explored {explored_count} nodes"))),
+        go.Frame(name='final', data=stage({trace.name for trace in dynamic}), traces=animated,
+                 layout=dict(title=dict(text=f"{title} - Path Found!"))),
+    ]
+    
+    # The figure opens on the final state; Play replays init -> explored -> final
+    fig.update_layout(
+        title=dict(text=f"{title} - Path Found!"),
+        updatemenus=[dict(
+            type='buttons',
+            showactive=False,
+            x=0.98, y=0.02,
+            xanchor='right', yanchor='bottom',
+            bgcolor='rgba(102, 126, 234, 0.8)',
+            font=dict(color='#e0e0e0'),
+            buttons=[dict(
+                label='▶ Play',
+                method='animate',
+                args=[None, {
+                    'frame': {'duration': frame_duration, 'redraw': True},
+                    'transition': {'duration': 0},
+                    'fromcurrent': False,
+                    'mode': 'immediate'
+                }]
+            )]
+        )]
+    )
     
     return fig
 
@@ -397,7 +465,6 @@ def create_simple_voxel_maze(engine, show_path_cells=False, path=None):
     Create a simplified voxel visualization showing only the maze structure.
     """
     fig = go.Figure()
-    path_set = set(path) if path else set()
     
     # Create wireframe for the maze
     wx, wy, wz = create_maze_wireframe(engine)
@@ -411,7 +478,8 @@ def create_simple_voxel_maze(engine, show_path_cells=False, path=None):
     
     # Highlight path cells if provided
     if path and show_path_cells:
-        px, py, pz = zip(*path)
+        path_arr = np.asarray(path, dtype=np.int64)
+        px, py, pz = path_arr[:, 0], path_arr[:, 1], path_arr[:, 2]
         fig.add_trace(go.Scatter3d(
             x=px, y=py, z=pz,
             mode='lines+markers',